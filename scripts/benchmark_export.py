@@ -0,0 +1,294 @@
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List
+
+from openpyxl import Workbook
+from openpyxl.chart import BarChart, LineChart, Reference
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from export_report_data import (  # noqa: E402
+    SheetValues,
+    build_sections,
+    extract_metadata,
+    extract_table_data,
+    is_section_name,
+    load_report_workbook,
+    parse_chart_files,
+)
+
+# Roughly the shape of the 1986-2024 edition: 5 sections, 63 indicator sheets,
+# about one chart per sheet with three series over 35 years, and a few tables
+SECTION_NAMES = ["SAMHÄLLSTRENDER", "POL SAKFRÅGOR", "MEDIETRENDER", "FÖRTROENDE", "LIVSSTIL"]
+DEFAULT_SECTIONS = 5
+DEFAULT_INDICATORS = 63
+DEFAULT_CHARTS = 1
+DEFAULT_SERIES = 3
+DEFAULT_YEARS = 35
+DEFAULT_TABLE_EVERY = 20
+
+STAGES = ("load", "parse_chart", "extract_metadata", "extract_table_data", "build_sections", "serialization")
+
+
+def generate_workbook(
+    path: Path,
+    sections: int = DEFAULT_SECTIONS,
+    indicators: int = DEFAULT_INDICATORS,
+    charts_per_sheet: int = DEFAULT_CHARTS,
+    series: int = DEFAULT_SERIES,
+    years: int = DEFAULT_YEARS,
+    table_every: int = DEFAULT_TABLE_EVERY,
+    seed: int = 1986,
+) -> Path:
+    """Write a synthetic Svenska Trender workbook.
+
+    Upper-case section sheets are followed by their indicator sheets. Each
+    indicator sheet has a Rubrik/Underrubrik/Fråga/Kommentar/Typ/Källa block
+    and a year-by-series data table; every ``table_every``-th sheet is a
+    "Tabell" sheet without charts, the others get ``charts_per_sheet``
+    alternating line and bar charts over the table. Some values are "..", as
+    in the real workbook."""
+    rng = random.Random(seed)
+    wb = Workbook()
+    wb.remove(wb.active)
+    first_year = 2025 - years
+    per_section = -(-indicators // sections)
+    created = 0
+    for section_idx in range(sections):
+        base_name = SECTION_NAMES[section_idx % len(SECTION_NAMES)]
+        section_name = base_name if section_idx < len(SECTION_NAMES) else f"{base_name} {section_idx // len(SECTION_NAMES) + 1}"
+        wb.create_sheet(section_name)
+        for _ in range(min(per_section, indicators - created)):
+            created += 1
+            is_table = table_every > 0 and created % table_every == 0
+            ws = wb.create_sheet(f"Ind {created}")
+            ws["A1"], ws["B1"] = "Rubrik", f"INDIKATOR {created} I SVENSKA TRENDER"
+            ws["A2"], ws["B2"] = "Underrubrik", f"Andel som svarar ja, {first_year}-2024"
+            ws["A3"], ws["B3"] = "Fråga", f"Vad anser du om påstående {created}?"
+            ws["A4"], ws["B4"] = "Kommentar", "Frågan ställdes inte alla år."
+            ws["A5"], ws["B5"] = "Typ", "Tabell" if is_table else "Diagram"
+            ws["A6"], ws["B6"] = "Källa", "Den nationella SOM-undersökningen"
+            ws.cell(8, 1, "År")
+            for serie_idx in range(series):
+                ws.cell(8, 2 + serie_idx, f"Serie {serie_idx + 1}")
+            for year_idx in range(years):
+                ws.cell(9 + year_idx, 1, first_year + year_idx)
+                for serie_idx in range(series):
+                    value = ".." if rng.random() < 0.05 else round(rng.uniform(0, 100), 1)
+                    ws.cell(9 + year_idx, 2 + serie_idx, value)
+            if is_table:
+                continue
+            categories = Reference(ws, min_col=1, min_row=9, max_row=8 + years)
+            data = Reference(ws, min_col=2, max_col=1 + series, min_row=8, max_row=8 + years)
+            for chart_idx in range(charts_per_sheet):
+                chart = LineChart() if (created + chart_idx) % 2 else BarChart()
+                chart.title = f"DIAGRAM {created}.{chart_idx + 1}"
+                chart.add_data(data, titles_from_data=True)
+                chart.set_categories(categories)
+                ws.add_chart(chart, f"H{2 + chart_idx * 16}")
+    wb.save(path)
+    return path
+
+
+def run_stages(workbook_path: Path, engine: str = "openpyxl") -> Dict[str, float]:
+    """Run the export pipeline once, timing each stage separately (seconds).
+
+    Mirrors ``build_report`` with ``jobs=1``, except that sheet metadata and
+    table extraction are timed apart and the sheet snapshots they share are
+    read beforehand, outside both stages."""
+    timings = {}
+    start = time.perf_counter()
+    workbook = load_report_workbook(workbook_path, engine)
+    timings["load"] = time.perf_counter() - start
+    try:
+        with zipfile.ZipFile(workbook_path, "r") as archive:
+            chart_files = sorted(
+                name for name in archive.namelist() if name.startswith("xl/charts/chart") and name.endswith(".xml")
+            )
+            start = time.perf_counter()
+            parsed = parse_chart_files(archive, chart_files, workbook)
+            timings["parse_chart"] = time.perf_counter() - start
+
+        snapshots = {name: SheetValues(workbook[name]) for name in workbook.sheetnames if not is_section_name(name)}
+
+        start = time.perf_counter()
+        metadata = {name: extract_metadata(ws) for name, ws in snapshots.items()}
+        timings["extract_metadata"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tables = {
+            name: extract_table_data(ws)
+            for name, ws in snapshots.items()
+            if (metadata[name].get("typ") or "").lower().strip() == "tabell"
+        }
+        timings["extract_table_data"] = time.perf_counter() - start
+
+        charts = defaultdict(list)
+        for _, chart_obj, _ in parsed:
+            if chart_obj:
+                charts[chart_obj.sheet].append(chart_obj)
+        extracted = {name: (metadata[name], tables.get(name)) for name in snapshots}
+        start = time.perf_counter()
+        sections = build_sections(workbook, charts, extracted)
+        timings["build_sections"] = time.perf_counter() - start
+    finally:
+        workbook.close()
+
+    payload = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source_workbook": workbook_path.name,
+        "section_count": len(sections),
+        "sections": sections,
+    }
+    start = time.perf_counter()
+    json.dumps(payload, ensure_ascii=False, indent=2)
+    timings["serialization"] = time.perf_counter() - start
+    return timings
+
+
+def benchmark(workbook_path: Path, repeat: int = 5, engine: str = "openpyxl") -> Dict[str, float]:
+    """Median time per stage over ``repeat`` runs."""
+    runs = [run_stages(workbook_path, engine) for _ in range(repeat)]
+    return {stage: statistics.median(run[stage] for run in runs) for stage in STAGES}
+
+
+def find_regressions(
+    current: Dict[str, float], baseline: Dict[str, float], threshold: float, min_delta: float
+) -> List[str]:
+    """Stages slower than the baseline by more than ``threshold`` (a fraction) and ``min_delta`` seconds."""
+    regressions = []
+    for stage in STAGES:
+        if stage not in baseline:
+            continue
+        before, after = baseline[stage], current[stage]
+        if after > before * (1 + threshold) and after - before > min_delta:
+            regressions.append(f"{stage}: {after * 1000:.1f} ms vs baseline {before * 1000:.1f} ms (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Svenska Trender export on a synthetic workbook.")
+    parser.add_argument(
+        "--workbook",
+        type=Path,
+        help="Benchmark this workbook instead of generating one.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Multiply the number of sections and indicator sheets of the generated workbook.",
+    )
+    parser.add_argument("--sections", type=int, default=DEFAULT_SECTIONS, help="Section sheets at scale 1.")
+    parser.add_argument("--indicators", type=int, default=DEFAULT_INDICATORS, help="Indicator sheets at scale 1.")
+    parser.add_argument("--charts", type=int, default=DEFAULT_CHARTS, help="Charts per non-table indicator sheet.")
+    parser.add_argument("--series", type=int, default=DEFAULT_SERIES, help="Series per chart.")
+    parser.add_argument("--years", type=int, default=DEFAULT_YEARS, help="Data rows (years) per indicator sheet.")
+    parser.add_argument(
+        "--table-every",
+        type=int,
+        default=DEFAULT_TABLE_EVERY,
+        help="Make every Nth indicator sheet a 'Tabell' sheet without charts (0 = none).",
+    )
+    parser.add_argument("--seed", type=int, default=1986, help="Random seed for the generated values.")
+    parser.add_argument(
+        "--keep-workbook",
+        type=Path,
+        help="Also save the generated workbook to this path.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("openpyxl", "fast"),
+        default="openpyxl",
+        help="Cell reader to benchmark.",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per stage; the median is reported.")
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=Path("scripts/benchmark-baseline.json"),
+        help="Baseline file to compare against (and to write with --save-baseline).",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the new baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Fail when a stage is slower than the baseline by more than this fraction.",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.005,
+        help="Ignore slowdowns smaller than this many seconds (timer noise on fast stages).",
+    )
+    args = parser.parse_args()
+
+    config = {
+        "sections": max(1, round(args.sections * args.scale)),
+        "indicators": max(1, round(args.indicators * args.scale)),
+        "charts_per_sheet": args.charts,
+        "series": args.series,
+        "years": args.years,
+        "table_every": args.table_every,
+        "seed": args.seed,
+    }
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.workbook:
+            workbook_path = args.workbook
+            config = {"workbook": workbook_path.name}
+        else:
+            workbook_path = generate_workbook(args.keep_workbook or Path(tmp_dir) / "synthetic.xlsx", **config)
+        timings = benchmark(workbook_path, args.repeat, args.engine)
+
+    print(f"{'Stage':<20}{'Median (ms)':>12}")
+    for stage in STAGES:
+        print(f"{stage:<20}{timings[stage] * 1000:>12.1f}")
+    print(f"{'total':<20}{sum(timings.values()) * 1000:>12.1f}")
+
+    record = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "engine": args.engine,
+        "repeat": args.repeat,
+        "workbook": config,
+        "stages": timings,
+    }
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"Saved baseline to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    if baseline.get("workbook") != config or baseline.get("engine") != args.engine:
+        print("WARNING: Baseline was recorded for a different workbook or engine; timings are not comparable.")
+    regressions = find_regressions(timings, baseline["stages"], args.threshold, args.min_delta)
+    if regressions:
+        print(f"FAILED: {len(regressions)} stage(s) regressed past {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"SUCCESS: No stage regressed past {args.threshold:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import argparse
+import json
+import sys
+import tempfile
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import List
+
+from openpyxl import load_workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from benchmark_export import generate_workbook  # noqa: E402
+from export_report_data import SheetValues, export, load_report_workbook  # noqa: E402
+
+
+def add_edge_cases(path: Path) -> Path:
+    """Add a "Tabell" sheet with the cell kinds the synthetic sheets lack.
+
+    Dates, times, booleans, floats that need full precision, large integers,
+    empty and padded text, gaps inside the table and a value far to the right
+    of it, so the used range is wider and longer than the table."""
+    wb = load_workbook(path)
+    ws = wb.create_sheet("Kantfall")
+    ws["A1"], ws["B1"] = "Rubrik", "KANTFALL FÖR LÄSARNA"
+    ws["A2"], ws["B2"] = "Typ", "Tabell"
+    ws["A3"], ws["B3"] = "Kommentar", "  Text med mellanslag  "
+    ws.append([])
+    ws.append(["År", "Andel", "Datum", "Flagga", "Anteckning"])
+    ws.append([1986, 0.1, datetime(1986, 9, 1, 12, 30), True, ""])
+    ws.append([])
+    ws.append([1987, 1 / 3, date(1987, 1, 2), False, " .. "])
+    ws.append([1988, 2**40, None, None, "slut"])
+    ws.append(["1989", -12.5, time(8, 15), None, None])
+    ws["J20"] = "långt bort"
+    ws["C6"].number_format = "yyyy-mm-dd hh:mm"
+    ws["C8"].number_format = "yyyy-mm-dd"
+    ws["C10"].number_format = "hh:mm"
+    wb.save(path)
+    return path
+
+
+def sheet_cells(values: SheetValues) -> List[tuple]:
+    """Rows of a snapshot as the exporter sees them through ``SheetValues.value``.
+
+    openpyxl pads every row to the used range while the fast engine stops at
+    the last stored cell; both read back as None, so trailing gaps are dropped."""
+    rows = []
+    for row_idx in range(1, values.max_row + 1):
+        row = [values.value(row_idx, col_idx) for col_idx in range(1, values.max_column + 1)]
+        while row and row[-1] is None:
+            row.pop()
+        rows.append(tuple(row))
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def compare_sheets(workbook_path: Path) -> List[str]:
+    """Sheets whose cell values differ between the openpyxl and fast engines."""
+    problems = []
+    reference = load_report_workbook(workbook_path, "openpyxl")
+    fast = load_report_workbook(workbook_path, "fast")
+    try:
+        if reference.sheetnames != fast.sheetnames:
+            return [f"sheet names differ: {reference.sheetnames} vs {fast.sheetnames}"]
+        for name in reference.sheetnames:
+            expected, actual = sheet_cells(SheetValues(reference[name])), sheet_cells(SheetValues(fast[name]))
+            if expected == actual:
+                continue
+            for row_idx, (expected_row, actual_row) in enumerate(zip(expected, actual), start=1):
+                if expected_row != actual_row:
+                    problems.append(f"{name} row {row_idx}: {expected_row!r} vs {actual_row!r}")
+                    break
+            else:
+                problems.append(f"{name}: {len(expected)} vs {len(actual)} rows")
+    finally:
+        reference.close()
+        fast.close()
+    return problems
+
+
+def compare_exports(workbook_path: Path, tmp_dir: Path) -> List[str]:
+    """Differences between the JSON reports of both engines (``generated_at`` aside)."""
+    reports = {}
+    for engine in ("openpyxl", "fast"):
+        output_path = tmp_dir / f"report-{engine}.json"
+        export(workbook_path, output_path, engine=engine)
+        report = json.loads(output_path.read_text(encoding="utf-8"))
+        report.pop("generated_at")
+        reports[engine] = report
+    if reports["openpyxl"] == reports["fast"]:
+        return []
+    problems = []
+    for section, other in zip(reports["openpyxl"]["sections"], reports["fast"]["sections"]):
+        for indicator, other_indicator in zip(section["indicators"], other["indicators"]):
+            if indicator != other_indicator:
+                problems.append(f"indicator {indicator['sheet']} differs")
+    return problems or ["reports differ outside the indicators"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that --engine fast reads workbooks exactly like openpyxl.")
+    parser.add_argument(
+        "--workbook",
+        type=Path,
+        help="Check this workbook instead of a generated one.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        if args.workbook:
+            workbook_path = args.workbook
+        else:
+            workbook_path = generate_workbook(tmp_dir / "synthetic.xlsx", sections=2, indicators=12, table_every=4)
+            add_edge_cases(workbook_path)
+        problems = compare_sheets(workbook_path) + compare_exports(workbook_path, tmp_dir)
+
+    if problems:
+        print(f"FAILED: The fast engine differs from openpyxl on {workbook_path.name}:")
+        for problem in problems:
+            print(f"  {problem}")
+        sys.exit(1)
+    print(f"SUCCESS: Both engines read {workbook_path.name} identically")
+
+
+if __name__ == "__main__":
+    main()
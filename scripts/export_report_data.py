@@ -1,38 +1,249 @@
 import argparse
+import bisect
+import csv
+import glob
+import gzip
+import hashlib
 import json
+import math
+import os
+import posixpath
 import re
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
 import unicodedata
 import zipfile
+from array import array
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import contextmanager, nullcontext
 from datetime import datetime, timezone
+from itertools import zip_longest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape, quoteattr
 from openpyxl import load_workbook
+from openpyxl.styles.numbers import builtin_format_code, is_date_format, is_timedelta_format
 from openpyxl.utils.cell import range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel, from_ISO8601
+
+try:
+    import brotli
+except ImportError:  # optional: only needed for .br files with --precompress
+    brotli = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: only needed for --format parquet
+    pyarrow = None
 
 
 NS = {
     "c": "http://schemas.openxmlformats.org/drawingml/2006/chart",
     "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
 }
 
+# Plot elements in priority order: a chart takes its type from the first of these
+# present, and the series of any further plots (combo charts) follow its own.
 CHART_TYPE_TAGS = [
-    ("line", ".//c:lineChart"),
-    ("bar", ".//c:barChart"),
-    ("area", ".//c:areaChart"),
-    ("scatter", ".//c:scatterChart"),
-    ("pie", ".//c:pieChart"),
-    ("doughnut", ".//c:doughnutChart"),
-    ("bubble", ".//c:bubbleChart"),
+    ("line", "lineChart"),
+    ("bar", "barChart"),
+    ("area", "areaChart"),
+    ("scatter", "scatterChart"),
+    ("pie", "pieChart"),
+    ("doughnut", "doughnutChart"),
+    ("bubble", "bubbleChart"),
 ]
 
+MAIN_NS = "{%s}" % NS["main"]
+ROW_TAG = f"{MAIN_NS}row"
+CELL_TAG = f"{MAIN_NS}c"
+VALUE_TAG = f"{MAIN_NS}v"
+INLINE_STRING_TAG = f"{MAIN_NS}is"
+SHARED_STRING_TAG = f"{MAIN_NS}si"
 
-def slugify(value: str) -> str:
+CHART_NS = "{%s}" % NS["c"]
+PLOT_TAGS = {f"{CHART_NS}{local_name}": chart_type for chart_type, local_name in CHART_TYPE_TAGS}
+PLOT_PRIORITY = {chart_type: idx for idx, (chart_type, _) in enumerate(CHART_TYPE_TAGS)}
+TITLE_TAG = f"{CHART_NS}title"
+SERIES_TAG = f"{CHART_NS}ser"
+SERIES_TEXT_TAG = f"{CHART_NS}tx"
+CATEGORY_TAG = f"{CHART_NS}cat"
+VALUE_SLOT_TAG = f"{CHART_NS}val"
+NUM_REF_TAG = f"{CHART_NS}numRef"
+STR_REF_TAG = f"{CHART_NS}strRef"
+MULTI_LEVEL_REF_TAG = f"{CHART_NS}multiLvlStrRef"
+# Reference types in the order they are preferred within one c:cat/c:val
+REF_TAGS = (NUM_REF_TAG, STR_REF_TAG, MULTI_LEVEL_REF_TAG)
+STR_CACHE_TAG = f"{CHART_NS}strCache"
+# A string cache point that Excel wrote for a number cell (General format), e.g. a year among text categories
+CACHED_NUMBER_TEXT = re.compile(r"-?\d+(\.\d+)?([Ee][-+]?\d+)?")
+TEXT_RUN_TAG = "{%s}t" % NS["a"]
+
+# Workbook parts hashed for --incremental
+CACHED_PART_PREFIXES = ("xl/worksheets/", "xl/charts/", "xl/sharedStrings", "xl/styles")
+
+# Indicator fields in the search index (--search-index), in field-bit order
+SEARCH_FIELDS = ("title", "underrubrik", "fraga", "kommentar", "kalla", "section")
+
+# Folded Swedish words too common to be worth indexing ("som" stays: SOM-institutet)
+SEARCH_STOPWORDS = frozenset("av de den det du eller en ett for fran har i med och om pa till ar att vad hur".split())
+
+# Upper bound on the points of a series' downsampled "sparkline"
+SPARKLINE_POINTS = 24
+
+# Static SVG charts (--svg): size, margins (top, right, bottom, left) and colours
+# follow the interactive charts of web-report
+SVG_TYPES = ("line", "bar", "area")
+SVG_WIDTH = 960
+SVG_HEIGHT = 480
+SVG_MARGIN = (16, 180, 48, 56)
+SVG_PALETTE = ("#111827", "#A44E07", "#2563EB", "#059669", "#9333EA", "#DC2626")
+# Part of every SVG's cache key; bump it when render_chart_svg draws differently
+SVG_RENDER_VERSION = 1
+
+# Metadata fields as (key, label, values rejected as the label's value). Labels are
+# matched case-insensitively against whole cells; see build_label_index.
+METADATA_LABELS = (
+    ("rubrik", "rubrik", ("fråga", "kommentar", "typ", "rubrik")),
+    ("underrubrik", "underrubrik", ("fråga", "kommentar", "typ", "rubrik", "underrubrik")),
+    ("fraga", "fråga", ("kommentar", "fråga")),
+    ("kommentar", "kommentar", ("fråga", "kommentar")),
+    ("typ", "typ", ()),
+    ("kalla", "källa", ("fråga", "kommentar", "typ", "rubrik", "underrubrik", "källa")),
+)
+
+# Indicator fields whose repeated texts --intern moves to the top-level string table
+INTERNED_INDICATOR_FIELDS = ("typ", "rubrik", "underrubrik", "fraga", "kommentar", "kalla")
+
+# Cells that mark a row of a "Tabell" sheet as metadata rather than table data
+TABLE_SKIP_LABELS = frozenset(
+    {"rubrik", "fråga", "kommentar", "kommentar2", "bortkodning", "typ", "enhet", "källa", "underrubrik", "frågeformulering"}
+)
+
+
+class Profiler:
+    """Wall time and tracemalloc peak of nested spans, for --profile and --trace-out.
+
+    Each span's ``memory_peak`` is its highest traced allocation above what was
+    allocated when it started; a parent's peak includes its children's."""
+
+    def __init__(self):
+        self.events = []
+        self._stack = []
+        self._origin = time.perf_counter()
+        tracemalloc.start()
+
+    @contextmanager
+    def span(self, name: str, category: str, args: Dict):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            self._stack[-1][1] = max(self._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield args
+        finally:
+            duration = time.perf_counter() - start
+            self._stack.pop()
+            frame[1] = max(frame[1], tracemalloc.get_traced_memory()[1])
+            if self._stack:
+                self._stack[-1][1] = max(self._stack[-1][1], frame[1])
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "start": start - self._origin,
+                    "duration": duration,
+                    "memory_peak": frame[1] - frame[0],
+                    "args": args,
+                }
+            )
+
+    def close(self) -> None:
+        tracemalloc.stop()
+
+    def trace_events(self) -> Dict:
+        """The spans in Chrome trace-event format (chrome://tracing, Perfetto)."""
+        return {
+            "displayTimeUnit": "ms",
+            "traceEvents": [
+                {
+                    "name": event["name"],
+                    "cat": event["cat"],
+                    "ph": "X",
+                    "ts": round(event["start"] * 1e6, 1),
+                    "dur": round(event["duration"] * 1e6, 1),
+                    "pid": os.getpid(),
+                    "tid": 0,
+                    "args": dict(event["args"], memory_peak=event["memory_peak"]),
+                }
+                for event in sorted(self.events, key=lambda event: event["start"])
+            ],
+        }
+
+    def print_summary(self, top: int = 10) -> None:
+        """Print per-stage totals and the ``top`` slowest sheets."""
+        print(f"{'Stage':<24}{'Wall (ms)':>12}{'Peak (KiB)':>12}")
+        for event in sorted((e for e in self.events if e["cat"] == "stage"), key=lambda e: e["start"]):
+            print(f"{event['name']:<24}{event['duration'] * 1000:>12.1f}{event['memory_peak'] / 1024:>12.0f}")
+
+        sheets = defaultdict(lambda: {"sheet": 0.0, "range": 0.0, "chart": 0.0, "peak": 0, "size": ""})
+        for event in self.events:
+            sheet_name = event["args"].get("sheet")
+            if sheet_name and event["cat"] in ("sheet", "range", "chart"):
+                entry = sheets[sheet_name]
+                entry[event["cat"]] += event["duration"]
+                entry["peak"] = max(entry["peak"], event["memory_peak"])
+                if "max_row" in event["args"]:
+                    entry["size"] = f"{event['args']['max_row']}x{event['args']['max_column']}"
+        if not sheets:
+            return
+        slowest = sorted(sheets.items(), key=lambda item: -(item[1]["sheet"] + item[1]["range"] + item[1]["chart"]))
+        print(f"\nSlowest {min(top, len(slowest))} of {len(slowest)} sheets:")
+        print(
+            f"{'Sheet':<32}{'Total (ms)':>11}{'Sheet':>9}{'Ranges':>9}{'Charts':>9}{'Peak (KiB)':>12}  {'Rows x cols'}"
+        )
+        for sheet_name, entry in slowest[:top]:
+            total = entry["sheet"] + entry["range"] + entry["chart"]
+            print(
+                f"{sheet_name[:31]:<32}{total * 1000:>11.1f}{entry['sheet'] * 1000:>9.1f}{entry['range'] * 1000:>9.1f}"
+                f"{entry['chart'] * 1000:>9.1f}{entry['peak'] / 1024:>12.0f}  {entry['size']}"
+            )
+
+
+# Set by main() for --profile/--trace-out; None keeps profile_span a no-op
+_profiler: Optional[Profiler] = None
+
+
+def profile_span(name: str, category: str = "stage", **args):
+    """Context manager timing a span when profiling is on; yields its args dict (None when off)."""
+    if _profiler is None:
+        return nullcontext()
+    return _profiler.span(name, category, args)
+
+
+def fold_text(value: str) -> str:
+    """Lower-case and strip diacritics ("Fråga" -> "fraga"), as in slugs."""
     value = unicodedata.normalize("NFKD", value.strip().lower())
-    value = "".join(ch for ch in value if not unicodedata.category(ch).startswith("M"))
-    value = re.sub(r"[^a-z0-9]+", "-", value)
+    return "".join(ch for ch in value if not unicodedata.category(ch).startswith("M"))
+
+
+def slugify(value: str) -> str:
+    value = re.sub(r"[^a-z0-9]+", "-", fold_text(value))
     return value.strip("-") or "section"
 
 
@@ -51,41 +262,371 @@ def normalize_ref(ref: str) -> Tuple[str, str]:
     return sheet, cells
 
 
-def read_range(ws, cell_range: str) -> List:
-    min_col, min_row, max_col, max_row = range_boundaries(cell_range)
-    values = []
-    for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
-        values.append([cell.value for cell in row])
+def read_block(ws, bounds: Tuple[int, int, int, int]) -> List[Tuple]:
+    """Read the values in ``(min_col, min_row, max_col, max_row)`` with one ``iter_rows`` pass.
+
+    Read-only worksheets stop at the last stored row, so the block is padded with
+    empty rows to the full height of ``bounds``."""
+    min_col, min_row, max_col, max_row = bounds
+    width = max_col - min_col + 1
+    block = [
+        tuple(row) + (None,) * (width - len(row))
+        for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col, values_only=True)
+    ]
+    block.extend([(None,) * width] * (max_row - min_row + 1 - len(block)))
+    return block
+
+
+def slice_block(block: List[Tuple], block_bounds: Tuple[int, int, int, int], bounds: Tuple[int, int, int, int]) -> List:
+    """Cut the sub-range ``bounds`` out of a block read with ``block_bounds``.
+
+    Single-column ranges come back as a flat list, like ``read_range``."""
+    min_col, min_row, max_col, max_row = bounds
+    col_offset = min_col - block_bounds[0]
+    row_offset = min_row - block_bounds[1]
+    rows = block[row_offset:row_offset + max_row - min_row + 1]
     if min_col == max_col:
-        return [row[0] for row in values]
-    return values
+        return [row[col_offset] for row in rows]
+    return [list(row[col_offset:col_offset + max_col - min_col + 1]) for row in rows]
+
+
+def read_range(ws, cell_range: str) -> List:
+    bounds = range_boundaries(cell_range)
+    return slice_block(read_block(ws, bounds), bounds, bounds)
+
+
+class SheetValues:
+    """Values-only snapshot of one worksheet, read in a single streaming pass.
+
+    Read-only worksheets re-parse the sheet XML on every ``ws.cell()`` call, so
+    the metadata and table scans work on this snapshot instead."""
+
+    def __init__(self, ws):
+        self.title = ws.title
+        self.rows = [tuple(row) for row in ws.iter_rows(values_only=True)]
+        self.max_row = len(self.rows)
+        self.max_column = max((len(row) for row in self.rows), default=0)
+
+    def value(self, row_idx: int, col_idx: int):
+        """Return the value at a 1-based (row, column) position, or None."""
+        if row_idx < 1 or row_idx > self.max_row:
+            return None
+        row = self.rows[row_idx - 1]
+        if col_idx < 1 or col_idx > len(row):
+            return None
+        return row[col_idx - 1]
+
+
+class FastWorksheet:
+    """Worksheet of a ``FastWorkbook``; streams plain value rows from its part."""
+
+    def __init__(self, parent: "FastWorkbook", title: str, part: str):
+        self.parent = parent
+        self.title = title
+        self.part = part
+
+    def _rows(self):
+        """Yield ``(row_idx, {col_idx: value})`` for each stored row, in sheet order."""
+        row_counter = 0
+        with self.parent.archive.open(self.part) as source:
+            for _, element in ET.iterparse(source):
+                if element.tag != ROW_TAG:
+                    continue
+                row_ref = element.get("r")
+                row_counter = int(float(row_ref)) if row_ref else row_counter + 1
+                col_counter = 0
+                values = {}
+                for cell in element.iter(CELL_TAG):
+                    coordinate = cell.get("r")
+                    if coordinate:
+                        col_counter = 0
+                        for ch in coordinate:
+                            if not ch.isalpha():
+                                break
+                            col_counter = col_counter * 26 + ord(ch.upper()) - 64
+                    else:
+                        col_counter += 1
+                    value = self.parent.cell_value(cell)
+                    if value is not None:
+                        values[col_counter] = value
+                element.clear()
+                yield row_counter, values
+
+    def iter_rows(self, min_row=None, max_row=None, min_col=None, max_col=None, values_only=True):
+        """Yield value tuples like openpyxl's ``iter_rows(values_only=True)``.
+
+        Missing rows inside the range come back empty; without ``max_col`` each row
+        runs up to its last stored cell."""
+        min_row = min_row or 1
+        min_col = min_col or 1
+        width = max_col - min_col + 1 if max_col else 0
+        empty = (None,) * width
+        expected = min_row
+        for row_idx, values in self._rows():
+            if max_row is not None and row_idx > max_row:
+                break
+            if row_idx < expected:
+                continue
+            while expected < row_idx:
+                yield empty
+                expected += 1
+            last_col = max_col or max(values, default=min_col - 1)
+            yield tuple(values.get(col_idx) for col_idx in range(min_col, last_col + 1))
+            expected = row_idx + 1
+
+
+class FastWorkbook:
+    """Minimal read-only workbook that reads cell values straight from the OOXML parts.
+
+    Offers the subset of the openpyxl read-only workbook the exporter uses
+    (``sheetnames``, item access, ``iter_rows``, ``epoch``, ``close``) and resolves
+    cell values the same way: shared and inline strings, booleans, cached formula
+    results and date-formatted numbers. Raises ValueError for workbooks it does not
+    support, such as strict OOXML files or chartsheets."""
+
+    def __init__(self, workbook_path: Path):
+        self.archive = zipfile.ZipFile(workbook_path, "r")
+        try:
+            self._read_workbook()
+        except Exception:
+            self.archive.close()
+            raise
+
+    def _read_workbook(self) -> None:
+        names = set(self.archive.namelist())
+        if "xl/workbook.xml" not in names or "xl/_rels/workbook.xml.rels" not in names:
+            raise ValueError("workbook parts are not at the standard xl/ locations")
+        workbook_root = ET.fromstring(self.archive.read("xl/workbook.xml"))
+        if workbook_root.tag != f"{{{NS['main']}}}workbook":
+            raise ValueError(f"unsupported workbook namespace {workbook_root.tag}")
+        properties = workbook_root.find("main:workbookPr", NS)
+        date1904 = properties is not None and properties.get("date1904") in ("1", "true")
+        self.epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        self._sheets = {}
+        for name, part, rel_type in workbook_sheets(self.archive):
+            if rel_type.endswith("/chartsheet"):
+                raise ValueError(f"chartsheet '{name}' is not supported")
+            if rel_type.endswith("/worksheet"):
+                if part not in names:
+                    raise ValueError(f"worksheet part {part} is missing")
+                self._sheets[name] = FastWorksheet(self, name, part)
+        self.sheetnames = list(self._sheets)
+
+        self.shared_strings = []
+        if "xl/sharedStrings.xml" in names:
+            with self.archive.open("xl/sharedStrings.xml") as source:
+                for _, element in ET.iterparse(source):
+                    if element.tag == SHARED_STRING_TAG:
+                        self.shared_strings.append(rich_text_content(element).replace("x005F_", ""))
+                        element.clear()
+
+        self.date_styles = set()
+        self.timedelta_styles = set()
+        if "xl/styles.xml" in names:
+            styles_root = ET.fromstring(self.archive.read("xl/styles.xml"))
+            custom_formats = {
+                int(num_fmt.get("numFmtId")): num_fmt.get("formatCode")
+                for num_fmt in styles_root.findall("main:numFmts/main:numFmt", NS)
+            }
+            for style_id, xf in enumerate(styles_root.findall("main:cellXfs/main:xf", NS)):
+                num_fmt_id = int(xf.get("numFmtId", 0))
+                fmt = custom_formats[num_fmt_id] if num_fmt_id in custom_formats else builtin_format_code(num_fmt_id)
+                if is_date_format(fmt):
+                    self.date_styles.add(style_id)
+                if is_timedelta_format(fmt):
+                    self.timedelta_styles.add(style_id)
+
+    def __getitem__(self, sheet_name: str) -> FastWorksheet:
+        return self._sheets[sheet_name]
+
+    def close(self) -> None:
+        self.archive.close()
+
+    def cell_value(self, cell: ET.Element):
+        """Resolve a ``<c>`` element to its value, as openpyxl does with ``data_only``."""
+        data_type = cell.get("t", "n")
+        if data_type == "inlineStr":
+            inline = cell.find(INLINE_STRING_TAG)
+            return rich_text_content(inline) if inline is not None else None
+        value = cell.findtext(VALUE_TAG) or None
+        if value is None:
+            return None
+        if data_type == "n":
+            value = cast_number(value)
+            style_id = int(cell.get("s") or 0)
+            if style_id in self.date_styles:
+                try:
+                    return from_excel(value, self.epoch, timedelta=style_id in self.timedelta_styles)
+                except (OverflowError, ValueError):
+                    return "#VALUE!"
+            return value
+        if data_type == "s":
+            return self.shared_strings[int(value)]
+        if data_type == "b":
+            return bool(int(value))
+        if data_type == "d":
+            return from_ISO8601(value)
+        return value
+
+
+def cast_number(value: str):
+    """Convert a stored number to int or float, as openpyxl does for cell values."""
+    if "." in value or "E" in value or "e" in value:
+        return float(value)
+    return int(value)
+
+
+def rich_text_content(element: ET.Element) -> str:
+    """Plain text of a shared or inline string: its ``<t>`` plus all run texts, without phonetics."""
+    snippets = [element.findtext("main:t", "", NS)]
+    snippets.extend(run.findtext("main:t", "", NS) for run in element.findall("main:r", NS))
+    return "".join(snippets)
+
+
+def load_report_workbook(workbook_path: Path, engine: str = "openpyxl"):
+    """Open the workbook once in read-only streaming mode.
+
+    Cached formula values are read (``data_only``) and the VBA payload is not
+    kept, since the export never writes the workbook back. The ``fast`` engine
+    reads the sheet parts directly and falls back to openpyxl for workbooks it
+    does not support."""
+    if engine == "fast":
+        try:
+            return FastWorkbook(workbook_path)
+        except ValueError as exc:
+            print(f"WARNING: Fast engine cannot read {workbook_path.name} ({exc}); using openpyxl")
+    return load_workbook(workbook_path, read_only=True, data_only=True, keep_vba=False)
+
+
+def workbook_archive(workbook_path: Path, workbook):
+    """Context manager for the workbook's zip archive, shared with a ``FastWorkbook``."""
+    if isinstance(workbook, FastWorkbook):
+        return nullcontext(workbook.archive)
+    return zipfile.ZipFile(workbook_path, "r")
 
 
 def extract_text(element: Optional[ET.Element]) -> Optional[str]:
+    """Text of a title or series name: its rich-text runs, else its cached string points."""
     if element is None:
         return None
     texts = []
-    for node in element.findall(".//a:t", NS):
-        if node.text:
-            texts.append(node.text)
+    cache = None
+    for node in element.iter():
+        if node.tag == TEXT_RUN_TAG:
+            if node.text:
+                texts.append(node.text)
+        elif node.tag == STR_CACHE_TAG and cache is None:
+            cache = node
     if texts:
         return "".join(texts).strip()
-    cache = element.find(".//c:strCache", NS)
     if cache is None:
         return None
     pts = []
     for pt in cache.findall(".//c:pt", NS):
-        if pt.find("c:v", NS) is not None and pt.find("c:v", NS).text:
-            pts.append(pt.find("c:v", NS).text)
+        value = pt.findtext("c:v", None, NS)
+        if value:
+            pts.append(value)
     return " ".join(pts).strip() if pts else None
 
 
-def extract_ref_text(node: ET.Element, xpath: str) -> Optional[str]:
-    for ref_type in ("c:numRef", "c:strRef", "c:multiLvlStrRef"):
-        ref = node.find(f"{xpath}/{ref_type}/c:f", NS)
-        if ref is not None and ref.text:
-            return ref.text
-    return None
+def read_ref_cache(ref_node: ET.Element, ref: str) -> Optional[Tuple[List, str]]:
+    """Read the values Excel cached for a ``c:numRef``/``c:strRef`` as ``(values, sheet_name)``.
+
+    The result has the shape ``read_range`` gives for ``ref``. Only single-column
+    and single-row references with a complete cache are read; None means the
+    values have to come from the cells. Excel leaves text cells out of a number
+    cache, so values such as ".." come back as None. A string cache also holds
+    the number cells, as text; points that read as a plain number are turned
+    back into one, so categories such as years match what the cells give."""
+    is_number_ref = ref_node.tag == NUM_REF_TAG
+    cache = ref_node.find("c:numCache" if is_number_ref else "c:strCache", NS)
+    if cache is None:
+        return None
+    try:
+        sheet_name, cells = normalize_ref(ref)
+        min_col, min_row, max_col, max_row = range_boundaries(cells)
+    except (ValueError, TypeError):
+        return None
+    if min_col != max_col and min_row != max_row:
+        return None
+    size = (max_col - min_col + 1) * (max_row - min_row + 1)
+    pt_count = cache.find("c:ptCount", NS)
+    if pt_count is None or int(pt_count.get("val", -1)) != size:
+        return None
+    values = [None] * size
+    for pt in cache.findall("c:pt", NS):
+        value = pt.findtext("c:v", None, NS)
+        if value is not None and is_number_ref:
+            try:
+                value = cast_number(value)
+            except ValueError:
+                pass
+        elif value is not None and CACHED_NUMBER_TEXT.fullmatch(value):
+            value = cast_number(value)
+        idx = int(pt.get("idx", -1))
+        if 0 <= idx < size:
+            values[idx] = value
+    return (values if min_col == max_col else [values]), sheet_name
+
+
+def read_chart_xml(xml_bytes: bytes) -> Dict:
+    """Collect what the exporter needs from a chart part in a single walk of its tree.
+
+    Returns ``{"title", "plots", "caches"}``: the text of the first ``c:title``,
+    one record per plot element in document order (``{"type", "series",
+    "cat_ref"}``, each series ``{"name", "cat_ref", "val_ref"}``) and the cached
+    values per data reference (see ``read_ref_cache``)."""
+    record = {"title": None, "plots": [], "caches": {}}
+    title_found = False
+
+    def read_slot(slot: ET.Element) -> Optional[str]:
+        # Returns the c:f of the preferred reference in a c:cat or c:val
+        refs = {}
+        for ref_node in slot:
+            if ref_node.tag in REF_TAGS:
+                ref = ref_node.findtext("c:f", None, NS)
+                if ref:
+                    refs.setdefault(ref_node.tag, ref)
+                    if ref_node.tag != MULTI_LEVEL_REF_TAG:
+                        cached = read_ref_cache(ref_node, ref)
+                        if cached is not None:
+                            record["caches"][ref] = cached
+        return next((refs[tag] for tag in REF_TAGS if tag in refs), None)
+
+    def read_series(ser: ET.Element) -> Dict:
+        series = {"name": None, "cat_ref": None, "val_ref": None}
+        for child in ser:
+            if child.tag == SERIES_TEXT_TAG:
+                series["name"] = extract_text(child)
+            elif child.tag == CATEGORY_TAG:
+                series["cat_ref"] = read_slot(child)
+            elif child.tag == VALUE_SLOT_TAG:
+                series["val_ref"] = read_slot(child)
+        return series
+
+    def walk(node: ET.Element) -> None:
+        nonlocal title_found
+        for child in node:
+            if child.tag == TITLE_TAG:
+                if not title_found:
+                    title_found = True
+                    record["title"] = extract_text(child)
+            elif child.tag in PLOT_TAGS:
+                plot = {"type": PLOT_TAGS[child.tag], "series": [], "cat_ref": None}
+                record["plots"].append(plot)
+                for plot_child in child:
+                    if plot_child.tag == SERIES_TAG:
+                        plot["series"].append(read_series(plot_child))
+                    elif plot_child.tag == CATEGORY_TAG:
+                        plot["cat_ref"] = read_slot(plot_child)
+                    else:
+                        walk(plot_child)
+            else:
+                walk(child)
+
+    walk(ET.fromstring(xml_bytes))
+    return record
 
 
 def fetch_range(workbook, ref: str) -> Tuple[List, str]:
@@ -96,44 +637,338 @@ def fetch_range(workbook, ref: str) -> Tuple[List, str]:
     return read_range(ws, cells), sheet_name
 
 
-def detect_chart(root: ET.Element) -> Tuple[Optional[str], Optional[ET.Element]]:
-    for chart_type, xpath in CHART_TYPE_TAGS:
-        node = root.find(xpath, NS)
-        if node is not None:
-            return chart_type, node
-    return None, None
+def plan_ranges(workbook, refs: Iterable[str]) -> Dict[str, Tuple[List, str]]:
+    """Read every chart reference with a single pass per sheet.
+
+    References are grouped by sheet and each sheet's union bounding box is read
+    once; the result maps each reference to ``(values, sheet_name)`` as returned
+    by ``fetch_range``. References that cannot be planned (unknown sheets,
+    whole-column or multi-area ranges) are left out so that ``fetch_range``
+    handles them, and reports them, as before."""
+    by_sheet = defaultdict(dict)
+    for ref in refs:
+        try:
+            sheet_name, cells = normalize_ref(ref)
+            bounds = range_boundaries(cells)
+        except ValueError:
+            continue
+        if None in bounds or sheet_name not in workbook.sheetnames:
+            continue
+        by_sheet[sheet_name][ref] = bounds
+
+    ranges = {}
+    for sheet_name, sheet_refs in by_sheet.items():
+        all_bounds = list(sheet_refs.values())
+        block_bounds = (
+            min(bounds[0] for bounds in all_bounds),
+            min(bounds[1] for bounds in all_bounds),
+            max(bounds[2] for bounds in all_bounds),
+            max(bounds[3] for bounds in all_bounds),
+        )
+        with profile_span(sheet_name, "range", sheet=sheet_name, refs=len(sheet_refs)):
+            block = read_block(workbook[sheet_name], block_bounds)
+        for ref, bounds in sheet_refs.items():
+            ranges[ref] = (slice_block(block, block_bounds, bounds), sheet_name)
+    return ranges
+
+
+def chart_range_refs(record: Dict) -> List[str]:
+    """List the category and value references that ``build_chart`` reads."""
+    refs = []
+    for plot in record["plots"]:
+        for series in plot["series"]:
+            refs.extend(ref for ref in (series["cat_ref"], series["val_ref"]) if ref)
+        if plot["cat_ref"]:
+            refs.append(plot["cat_ref"])
+    return refs
+
+
+def parse_chart(xml_bytes: bytes, workbook, ranges: Optional[Dict[str, Tuple[List, str]]] = None) -> Optional["Chart"]:
+    return build_chart(read_chart_xml(xml_bytes), workbook, ranges)
+
+
+def is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def clean_float(value: float) -> float:
+    # Drop float noise such as 47.5 - 51.1 = -3.6000000000000014
+    return float(f"{value:.10g}")
+
+
+def coerce_number(value) -> float:
+    """A cell value as a float: numbers as is, numeric text ("12,5") parsed, anything else NaN."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip().replace("\xa0", "").replace(" ", "").replace(",", "."))
+        except ValueError:
+            return math.nan
+    return math.nan
+
+
+def json_number(value: float):
+    """Undo ``coerce_number`` for output: NaN/inf become null and whole numbers ints again."""
+    if not math.isfinite(value):
+        return None
+    return int(value) if float(value).is_integer() and abs(value) < 2**53 else value
+
+
+def summarize_series(values: List, categories: Optional[List]) -> Optional[Dict]:
+    """Summarize a series' numeric points (text such as ".." and gaps are skipped).
+
+    Gives the number of points, the latest value and its category, the change
+    since the previous measurement, min/max, and the least-squares trend per
+    category step (per year when categories are numbers, else per point).
+    Returns None when the series has no numeric points."""
+    if any(isinstance(value, list) for value in values):
+        return None
+    points = [(idx, value) for idx, value in enumerate(values) if is_number(value)]
+    if not points:
+        return None
+    categories = categories if isinstance(categories, list) else []
+
+    def category(idx: int):
+        return categories[idx] if idx < len(categories) else None
+
+    xs = [category(idx) for idx, _ in points]
+    if not all(is_number(x) for x in xs):
+        xs = [idx for idx, _ in points]
+    trend = None
+    if len(points) > 1:
+        mean_x = sum(xs) / len(xs)
+        mean_y = sum(value for _, value in points) / len(points)
+        spread = sum((x - mean_x) ** 2 for x in xs)
+        if spread:
+            trend = clean_float(sum((x - mean_x) * (value - mean_y) for x, (_, value) in zip(xs, points)) / spread)
+
+    latest_idx, latest = points[-1]
+    previous_idx, previous = points[-2] if len(points) > 1 else (None, None)
+    numbers = [value for _, value in points]
+    return {
+        "count": len(points),
+        "latest": json_number(latest),
+        "latest_category": category(latest_idx),
+        "change": clean_float(latest - previous) if previous is not None else None,
+        "previous_category": category(previous_idx) if previous_idx is not None else None,
+        "min": json_number(min(numbers)),
+        "max": json_number(max(numbers)),
+        "trend": trend,
+    }
+
+
+def downsample_lttb(points: List[Tuple[int, float]], threshold: int) -> List[Tuple[int, float]]:
+    """Largest-Triangle-Three-Buckets: keep ``threshold`` points that preserve the line's shape.
+
+    Always keeps the first and last point; from each bucket in between it keeps
+    the point spanning the largest triangle with the previously kept point and
+    the average of the next bucket."""
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    kept = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, len(points))
+        next_bucket = points[end:next_end] or points[-1:]
+        avg_x = sum(x for x, _ in next_bucket) / len(next_bucket)
+        avg_y = sum(y for _, y in next_bucket) / len(next_bucket)
+        kept_x, kept_y = points[kept]
+        best, best_area = start, -1.0
+        for idx in range(start, end):
+            x, y = points[idx]
+            area = abs((kept_x - avg_x) * (y - kept_y) - (kept_x - x) * (avg_y - kept_y))
+            if area > best_area:
+                best, best_area = idx, area
+        sampled.append(points[best])
+        kept = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def sparkline(values: List, max_points: int = SPARKLINE_POINTS) -> Optional[List[List]]:
+    """Downsample a series' numeric points to at most ``max_points`` ``[index, value]`` pairs.
+
+    Indexes point into the full ``values``/``categories``."""
+    if any(isinstance(value, list) for value in values):
+        return None
+    points = [(idx, value) for idx, value in enumerate(values) if is_number(value)]
+    return [[idx, json_number(value)] for idx, value in downsample_lttb(points, max_points)]
+
+
+def overview_path_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.overview.json")
+
+
+def build_overview(payload: Dict) -> Dict:
+    """Collect ``summarize_series`` and ``sparkline`` of every series, for overviews that skip the report.
 
+    ``indicators`` maps each indicator's sheet to its charts, each a list of
+    ``{name, summary, sparkline}`` per series. Charts shown latest year first
+    (see ``iter_indicators``) are summarized in time order; sparkline indexes
+    always point into the values as exported."""
+    indicators = {}
+    for section in payload["sections"]:
+        for indicator in section["indicators"]:
+            charts = []
+            for chart in indicator["charts"]:
+                categories = chart["categories"] if isinstance(chart["categories"], list) else []
+                years = [category_year(category) for category in categories]
+                flip = None not in years and len(set(years)) > 1 and years == sorted(years, reverse=True)
+                if flip:
+                    categories = categories[::-1]
+                series = []
+                for serie in chart["series"]:
+                    values = serie["values"][::-1] if flip else serie["values"]
+                    line = sparkline(values)
+                    if flip and line:
+                        last = len(values) - 1
+                        line = [[last - idx, value] for idx, value in reversed(line)]
+                    series.append({"name": serie["name"], "summary": summarize_series(values, categories), "sparkline": line})
+                charts.append(series)
+            indicators[indicator["sheet"]] = charts
+    return {"version": 1, "generated_at": payload["generated_at"], "indicators": indicators}
+
+
+class Series:
+    """One chart series.
+
+    Flat values are held as a float array (NaN where a cell is empty or not a
+    number) and read through ``view``, so reversing is a flag rather than a
+    copy; series with multi-column values keep their nested lists. ``to_dict``
+    is the serialization boundary."""
+
+    __slots__ = ("name", "values", "type", "reversed")
+
+    def __init__(self, name: str, values, type: Optional[str] = None):
+        if not any(isinstance(value, list) for value in values):
+            values = array("d", map(coerce_number, values))
+        self.name = name
+        self.values = values
+        self.type = type
+        self.reversed = False
+
+    def view(self):
+        values = memoryview(self.values) if isinstance(self.values, array) else self.values
+        return values[::-1] if self.reversed else values
+
+    def reverse(self) -> None:
+        self.reversed = not self.reversed
+
+    def to_dict(self) -> Dict:
+        values = self.view()
+        serie = {
+            "name": self.name,
+            "values": [json_number(value) for value in values] if isinstance(self.values, array) else list(values),
+        }
+        if self.type:
+            serie["type"] = self.type
+        return serie
+
+    @classmethod
+    def from_dict(cls, serie: Dict) -> "Series":
+        return cls(serie["name"], serie["values"], serie.get("type"))
+
+
+class Chart:
+    """A parsed chart; ``id`` and ``source`` are set once it is known to belong to a sheet.
+
+    Like its series, a reversed chart only flips a flag; categories are read
+    back to front when serialized."""
+
+    __slots__ = ("title", "sheet", "type", "categories", "series", "id", "source", "reversed")
 
-def parse_chart(xml_bytes: bytes, workbook) -> Optional[Dict]:
-    root = ET.fromstring(xml_bytes)
-    chart_type, chart_node = detect_chart(root)
-    if chart_node is None:
+    def __init__(self, title, sheet, type, categories, series: List[Series], id=None, source=None):
+        self.title = title
+        self.sheet = sheet
+        self.type = type
+        self.categories = categories
+        self.series = series
+        self.id = id
+        self.source = source
+        self.reversed = False
+
+    def view(self):
+        return self.categories[::-1] if self.reversed and self.categories else self.categories
+
+    def reverse(self) -> None:
+        """Put the latest year first (see ``iter_indicators``)."""
+        self.reversed = not self.reversed
+        for serie in self.series:
+            if len(serie.values):
+                serie.reverse()
+
+    def to_dict(self) -> Dict:
+        chart = {
+            "title": self.title,
+            "sheet": self.sheet,
+            "type": self.type,
+            "categories": self.view(),
+            "series": [serie.to_dict() for serie in self.series],
+        }
+        if self.id is not None:
+            chart["id"] = self.id
+            chart["source"] = self.source
+        return chart
+
+    @classmethod
+    def from_dict(cls, chart: Dict) -> "Chart":
+        return cls(
+            chart["title"],
+            chart["sheet"],
+            chart["type"],
+            chart["categories"],
+            [Series.from_dict(serie) for serie in chart["series"]],
+            chart.get("id"),
+            chart.get("source"),
+        )
+
+
+def build_chart(record: Dict, workbook, ranges: Optional[Dict[str, Tuple[List, str]]] = None) -> Optional[Chart]:
+    """Build a chart from a ``read_chart_xml`` record.
+
+    ``ranges`` holds references already read by ``plan_ranges`` (or from the
+    chart caches); anything missing from it is fetched from the workbook
+    directly. The chart type and first series come from the highest-priority
+    plot; series of further plots carry their own ``type``."""
+    ranges = ranges or {}
+
+    def fetch(ref: str) -> Tuple[List, str]:
+        if ref in ranges:
+            return ranges[ref]
+        return fetch_range(workbook, ref)
+
+    if not record["plots"]:
         return None
-    title = extract_text(root.find(".//c:title", NS))
+    plots = sorted(record["plots"], key=lambda plot: PLOT_PRIORITY[plot["type"]])
+    chart_type = plots[0]["type"]
+    title = record["title"]
     series_data = []
     categories = None
     sheet_name = None
 
-    for ser in chart_node.findall("c:ser", NS):
-        label = extract_text(ser.find("c:tx", NS)) or ""
-        cat_ref = extract_ref_text(ser, "c:cat")
-        if cat_ref and categories is None:
-            categories, sheet_name = fetch_range(workbook, cat_ref)
-        val_ref = extract_ref_text(ser, "c:val")
-        if not val_ref:
-            continue
-        values, val_sheet = fetch_range(workbook, val_ref)
-        sheet_name = sheet_name or val_sheet
-        series_data.append({"name": label, "values": values})
+    for plot_idx, plot in enumerate(plots):
+        for ser in plot["series"]:
+            label = ser["name"] or ""
+            cat_ref = ser["cat_ref"]
+            if cat_ref and categories is None:
+                categories, sheet_name = fetch(cat_ref)
+            val_ref = ser["val_ref"]
+            if not val_ref:
+                continue
+            values, val_sheet = fetch(val_ref)
+            sheet_name = sheet_name or val_sheet
+            series_data.append(Series(label, values, plot["type"] if plot_idx else None))
+
+        if series_data and categories is None and plot["cat_ref"]:
+            categories, sheet_name = fetch(plot["cat_ref"])
 
     if not series_data:
         return None
 
-    if categories is None:
-        cat_ref = extract_ref_text(chart_node, "c:cat")
-        if cat_ref:
-            categories, sheet_name = fetch_range(workbook, cat_ref)
-
     # Convert title from ALL CAPS to sentence case if needed
     display_title = title
     if title:
@@ -152,227 +987,154 @@ def parse_chart(xml_bytes: bytes, workbook) -> Optional[Dict]:
             else:
                 display_title = title.capitalize()
     
-    return {
-        "title": display_title,
-        "sheet": sheet_name,
-        "type": chart_type,
-        "categories": categories,
-        "series": series_data,
-    }
+    return Chart(display_title, sheet_name, chart_type, categories, series_data)
 
 
-def extract_table_data(ws) -> Optional[List[List[Optional[str]]]]:
-    """Extract table data from worksheet, skipping metadata rows.
-    Looks for the actual data table, avoiding rows with 'Rubrik', 'Fråga', 'Kommentar', 'Typ', etc."""
-    # Metadata labels to skip
-    metadata_labels = {"rubrik", "fråga", "kommentar", "kommentar2", "bortkodning", "typ", "enhet", "källa", "underrubrik", "frågeformulering"}
-    
-    table_data = []
-    max_rows_to_check = 200
-    max_cols = 50  # Increased for tables with many columns
-    
-    # Find the actual data table - look for a row that looks like a header (contains "År" or year numbers)
-    start_row = None
-    for row_idx in range(1, min(max_rows_to_check + 1, ws.max_row + 1)):
-        row = ws[row_idx]
-        row_values = []
-        for col_idx in range(1, min(max_cols + 1, ws.max_column + 1)):
-            cell = ws.cell(row_idx, col_idx)
-            if cell.value is not None:
-                cell_str = str(cell.value).strip().lower()
-                # Skip rows that contain metadata labels
-                if cell_str in metadata_labels:
-                    break
-                row_values.append(str(cell.value).strip())
-            else:
-                row_values.append("")
-        
-        # Check if this looks like a table header (contains "År" or starts with a year-like number)
-        if row_values:
-            first_cell = row_values[0].lower() if row_values[0] else ""
-            # This is likely the header row if it contains "år" or starts with a 4-digit year
-            if "år" in first_cell or (first_cell.isdigit() and len(first_cell) == 4 and 1980 <= int(first_cell) <= 2100):
-                start_row = row_idx
-                break
-    
+def is_table_header(value) -> bool:
+    """Whether a first-column value starts a table: an "År" heading or a year 1980-2100."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip().lower() if value is not None else ""
+    return "år" in text or (text.isdigit() and len(text) == 4 and 1980 <= int(text) <= 2100)
+
+
+def table_cell(value):
+    """Table value of a cell: numbers as they are, dates as their year, text stripped (empty text is None).
+
+    Booleans become "True"/"False" as in earlier exports; as JSON true/false
+    the web report would show them as empty cells."""
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, bool):
+        return str(value)
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y")
+    return value
+
+
+def is_table_skip_row(row: Tuple) -> bool:
+    """Whether a row holds metadata (a label cell, or a Kommentar/Bortkodning note) rather than table data."""
+    for value in row:
+        if isinstance(value, str):
+            text = value.strip().lower()
+            if text in TABLE_SKIP_LABELS or text.startswith(("kommentar", "bortkodning")):
+                return True
+    return False
+
+
+def extract_table_data(ws: SheetValues) -> Optional[List[List[Union[str, float, None]]]]:
+    """Extract the data table of a "Tabell" sheet as one rectangular block, header row first.
+
+    The header is the first row whose first cell contains "År" or is a year; the
+    block runs from there to the end of the sheet's used range, without metadata
+    and empty rows, and is as wide as its widest row. Numbers stay numbers and
+    missing cells are None."""
+    rows = ws.rows
+    start_row = next((idx for idx, row in enumerate(rows) if row and is_table_header(row[0])), None)
     if start_row is None:
         return None
-    
-    # Extract table starting from the header row
-    for row_idx in range(start_row, min(start_row + 100, ws.max_row + 1)):
-        row = ws[row_idx]
-        row_data = []
-        is_metadata_row = False
-        
-        for col_idx in range(1, min(max_cols + 1, ws.max_column + 1)):
-            cell = ws.cell(row_idx, col_idx)
-            if cell.value is not None:
-                cell_str = str(cell.value).strip().lower()
-                # Skip this row if it contains metadata labels
-                if cell_str in metadata_labels:
-                    is_metadata_row = True
-                    break
-                # Also skip rows that start with "kommentar" or "bortkodning" (case-insensitive)
-                if cell_str.startswith("kommentar") or cell_str.startswith("bortkodning"):
-                    is_metadata_row = True
-                    break
-                
-                # Convert to string, handling dates and numbers
-                if isinstance(cell.value, (int, float)):
-                    row_data.append(str(cell.value))
-                elif hasattr(cell.value, 'strftime'):  # datetime
-                    row_data.append(cell.value.strftime('%Y'))
-                else:
-                    row_data.append(str(cell.value).strip())
-            else:
-                row_data.append(None)
-        
-        # Skip metadata rows
-        if is_metadata_row:
+
+    block = []
+    width = 0
+    for row in rows[start_row:]:
+        if is_table_skip_row(row):
             continue
-        
-        # Only add row if it has at least one non-None value
-        if any(row_data):
-            # Trim trailing None values
-            while row_data and row_data[-1] is None:
-                row_data.pop()
-            if row_data:
-                table_data.append(row_data)
-    
-    return table_data if len(table_data) > 1 else None  # Need at least header + 1 row
+        cells = [table_cell(value) for value in row]
+        used = len(cells)
+        while used and cells[used - 1] is None:
+            used -= 1
+        if used:
+            block.append(cells)
+            width = max(width, used)
+    if len(block) < 2:  # Need at least header + 1 row
+        return None
+    return [cells[:width] + [None] * (width - len(cells)) for cells in block]
 
 
-def extract_metadata(ws) -> Dict[str, Optional[str]]:
+def build_label_index(
+    ws: SheetValues, labels: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = METADATA_LABELS
+) -> Dict[str, Tuple[int, int, str]]:
+    """Index metadata labels in one pass over the sheet's first 300 rows and 30 columns.
+
+    Maps each metadata key to ``(row, column, value)`` for the first occurrence of its
+    label that resolves to a value: the first acceptable non-empty cell among the next
+    four cells in the row, else the cell directly below."""
+    known_labels = {label for _, label, _ in labels}
+    positions = defaultdict(list)
+    for row_idx, row in enumerate(ws.rows[:300], start=1):
+        for col_idx, value in enumerate(row[:30], start=1):
+            if value and isinstance(value, str):
+                label = value.strip().lower()
+                if label in known_labels:
+                    positions[label].append((row_idx, col_idx))
+
+    index = {}
+    for key, label, rejected in labels:
+        # Values that are just another label (or empty) are never accepted
+        rejected_values = {"", *rejected}
+        for row_idx, col_idx in positions.get(label, ()):
+            value = None
+            # Try next cell in same row (most common pattern: "Label" | "Value")
+            for next_col in range(col_idx + 1, min(col_idx + 5, ws.max_column + 1)):
+                next_cell_value = ws.value(row_idx, next_col)
+                if next_cell_value:
+                    next_value = str(next_cell_value).strip()
+                    if next_value.lower() not in rejected_values:
+                        value = next_value
+                        break
+            # Also try cell below (sometimes label is above value)
+            if not value and row_idx < ws.max_row:
+                below_cell_value = ws.value(row_idx + 1, col_idx)
+                if below_cell_value:
+                    below_value = str(below_cell_value).strip()
+                    if below_value.lower() not in rejected_values:
+                        value = below_value
+            if value:
+                index[key] = (row_idx, col_idx, value)
+                break
+    return index
+
+
+def extract_metadata(
+    ws: SheetValues, labels: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = METADATA_LABELS
+) -> Dict[str, Optional[str]]:
     """Extract 'Rubrik', 'Underrubrik', 'Fråga', 'Kommentar', 'Typ', and 'Källa' from worksheet."""
-    metadata = {"rubrik": None, "underrubrik": None, "fraga": None, "kommentar": None, "typ": None, "kalla": None}
-    
-    # Search more thoroughly - check first 300 rows and 30 columns
-    for row_idx in range(1, min(301, ws.max_row + 1)):
-        for col_idx in range(1, min(31, ws.max_column + 1)):
-            cell = ws.cell(row_idx, col_idx)
-            if cell.value and isinstance(cell.value, str):
-                cell_value = str(cell.value).strip()
-                
-                # Check for "Fråga" - exact match (case-insensitive)
-                if cell_value.lower() == "fråga" and not metadata["fraga"]:
-                    # Try next cell in same row (most common pattern: "Fråga" | "Question text")
-                    for next_col in range(col_idx + 1, min(col_idx + 5, ws.max_column + 1)):
-                        next_cell = ws.cell(row_idx, next_col)
-                        if next_cell.value:
-                            next_value = str(next_cell.value).strip()
-                            # Skip if it's just "Kommentar" or empty
-                            if next_value and next_value.lower() not in ["kommentar", "fråga", ""]:
-                                metadata["fraga"] = next_value
-                                break
-                    # Also try cell below (sometimes label is above value)
-                    if not metadata["fraga"] and row_idx < ws.max_row:
-                        below_cell = ws.cell(row_idx + 1, col_idx)
-                        if below_cell.value:
-                            below_value = str(below_cell.value).strip()
-                            if below_value and below_value.lower() not in ["kommentar", "fråga", ""]:
-                                metadata["fraga"] = below_value
-                
-                # Check for "Kommentar" - exact match (case-insensitive)
-                if cell_value.lower() == "kommentar" and not metadata["kommentar"]:
-                    # Try next cell in same row (most common pattern: "Kommentar" | "Comment text")
-                    for next_col in range(col_idx + 1, min(col_idx + 5, ws.max_column + 1)):
-                        next_cell = ws.cell(row_idx, next_col)
-                        if next_cell.value:
-                            next_value = str(next_cell.value).strip()
-                            # Skip if it's just "Fråga" or empty
-                            if next_value and next_value.lower() not in ["fråga", "kommentar", ""]:
-                                metadata["kommentar"] = next_value
-                                break
-                    # Also try cell below (sometimes label is above value)
-                    if not metadata["kommentar"] and row_idx < ws.max_row:
-                        below_cell = ws.cell(row_idx + 1, col_idx)
-                        if below_cell.value:
-                            below_value = str(below_cell.value).strip()
-                            if below_value and below_value.lower() not in ["fråga", "kommentar", ""]:
-                                metadata["kommentar"] = below_value
-                
-                # Check for "Typ" - exact match (case-insensitive)
-                if cell_value.lower() == "typ" and not metadata["typ"]:
-                    # Try next cell in same row (most common pattern: "Typ" | "Tabell" or "Diagram")
-                    for next_col in range(col_idx + 1, min(col_idx + 5, ws.max_column + 1)):
-                        next_cell = ws.cell(row_idx, next_col)
-                        if next_cell.value:
-                            next_value = str(next_cell.value).strip()
-                            if next_value:
-                                metadata["typ"] = next_value
-                                break
-                    # Also try cell below
-                    if not metadata["typ"] and row_idx < ws.max_row:
-                        below_cell = ws.cell(row_idx + 1, col_idx)
-                        if below_cell.value:
-                            below_value = str(below_cell.value).strip()
-                            if below_value:
-                                metadata["typ"] = below_value
-                
-                # Check for "Rubrik" - exact match (case-insensitive)
-                if cell_value.lower() == "rubrik" and not metadata["rubrik"]:
-                    # Try next cell in same row (most common pattern: "Rubrik" | "Heading text")
-                    for next_col in range(col_idx + 1, min(col_idx + 5, ws.max_column + 1)):
-                        next_cell = ws.cell(row_idx, next_col)
-                        if next_cell.value:
-                            next_value = str(next_cell.value).strip()
-                            if next_value and next_value.lower() not in ["fråga", "kommentar", "typ", "rubrik", ""]:
-                                metadata["rubrik"] = next_value
-                                break
-                    # Also try cell below
-                    if not metadata["rubrik"] and row_idx < ws.max_row:
-                        below_cell = ws.cell(row_idx + 1, col_idx)
-                        if below_cell.value:
-                            below_value = str(below_cell.value).strip()
-                            if below_value and below_value.lower() not in ["fråga", "kommentar", "typ", "rubrik", ""]:
-                                metadata["rubrik"] = below_value
-                
-                # Check for "Underrubrik" - exact match (case-insensitive)
-                if cell_value.lower() == "underrubrik" and not metadata["underrubrik"]:
-                    # Try next cell in same row
-                    for next_col in range(col_idx + 1, min(col_idx + 5, ws.max_column + 1)):
-                        next_cell = ws.cell(row_idx, next_col)
-                        if next_cell.value:
-                            next_value = str(next_cell.value).strip()
-                            if next_value and next_value.lower() not in ["fråga", "kommentar", "typ", "rubrik", "underrubrik", ""]:
-                                metadata["underrubrik"] = next_value
-                                break
-                    # Also try cell below
-                    if not metadata["underrubrik"] and row_idx < ws.max_row:
-                        below_cell = ws.cell(row_idx + 1, col_idx)
-                        if below_cell.value:
-                            below_value = str(below_cell.value).strip()
-                            if below_value and below_value.lower() not in ["fråga", "kommentar", "typ", "rubrik", "underrubrik", ""]:
-                                metadata["underrubrik"] = below_value
-                
-                # Check for "Källa" - exact match (case-insensitive)
-                if cell_value.lower() == "källa" and not metadata["kalla"]:
-                    # Try next cell in same row (most common pattern: "Källa" | "Source text")
-                    for next_col in range(col_idx + 1, min(col_idx + 5, ws.max_column + 1)):
-                        next_cell = ws.cell(row_idx, next_col)
-                        if next_cell.value:
-                            next_value = str(next_cell.value).strip()
-                            # Skip if it's just another metadata label or empty
-                            if next_value and next_value.lower() not in ["fråga", "kommentar", "typ", "rubrik", "underrubrik", "källa", ""]:
-                                metadata["kalla"] = next_value
-                                break
-                    # Also try cell below (sometimes label is above value)
-                    if not metadata["kalla"] and row_idx < ws.max_row:
-                        below_cell = ws.cell(row_idx + 1, col_idx)
-                        if below_cell.value:
-                            below_value = str(below_cell.value).strip()
-                            if below_value and below_value.lower() not in ["fråga", "kommentar", "typ", "rubrik", "underrubrik", "källa", ""]:
-                                metadata["kalla"] = below_value
-    
-    return metadata
+    index = build_label_index(ws, labels)
+    return {key: index[key][2] if key in index else None for key, _, _ in labels}
 
 
-def build_sections(workbook, charts: Dict[str, List[Dict]]) -> List[Dict]:
-    sections = []
+def extract_sheet(workbook, sheet_name: str) -> Tuple[Dict[str, Optional[str]], Optional[List[List[Union[str, float, None]]]]]:
+    """Read one indicator sheet's metadata, and its table when Typ says "Tabell"."""
+    with profile_span(sheet_name, "sheet", sheet=sheet_name) as span:
+        ws = SheetValues(workbook[sheet_name])
+        metadata = extract_metadata(ws)
+        table_data = None
+        if metadata.get("typ") and metadata["typ"].lower().strip() == "tabell":
+            table_data = extract_table_data(ws)
+        if span is not None:
+            span.update(max_row=ws.max_row, max_column=ws.max_column)
+    return metadata, table_data
+
+
+def iter_indicators(
+    workbook,
+    charts: Union[Dict[str, List[Dict]], Callable[[str], List[Dict]]],
+    extracted: Optional[Dict[str, Tuple[Dict[str, Optional[str]], Optional[List[List[Union[str, float, None]]]]]]] = None,
+    sheet_names: Optional[List[str]] = None,
+) -> Iterator[Tuple[Dict, Dict]]:
+    """Yield ``(section, indicator)`` for every indicator sheet, in workbook order.
+
+    ``charts`` maps sheet names to their charts, or is a function returning a
+    sheet's charts when it is reached. ``extracted`` may hold ``extract_sheet``
+    results computed elsewhere (e.g. by worker processes); sheets missing from
+    it are read here. ``sheet_names`` limits the sheets considered (default:
+    all sheets of the workbook). The same section dict is yielded for all
+    indicators of a section; its "indicators" list is left empty."""
+    extracted = extracted or {}
     current_section = None
     processed_sheets = []
 
-    for sheet_name in workbook.sheetnames:
+    for sheet_name in workbook.sheetnames if sheet_names is None else sheet_names:
         if is_section_name(sheet_name):
             # Expand abbreviations in section titles
             section_title = sheet_name
@@ -385,19 +1147,15 @@ def build_sections(workbook, charts: Dict[str, List[Dict]]) -> List[Dict]:
                 "slug": slugify(sheet_name),
                 "indicators": [],
             }
-            sections.append(section)
             current_section = section
             continue
 
-        chart_list = charts.get(sheet_name, [])
+        chart_list = charts(sheet_name) if callable(charts) else charts.get(sheet_name, [])
         # Include sheet even if it has no charts (might have metadata or table data)
-        ws = workbook[sheet_name]
-        metadata = extract_metadata(ws)
-        
-        # Extract table data only if Typ says "Tabell"
-        table_data = None
-        if metadata.get("typ") and metadata["typ"].lower().strip() == "tabell":
-            table_data = extract_table_data(ws)
+        if sheet_name in extracted:
+            metadata, table_data = extracted[sheet_name]
+        else:
+            metadata, table_data = extract_sheet(workbook, sheet_name)
         
         # Check if we need to reverse the order (latest year first)
         # For "Medborgarnas viktigaste samhällsproblem", "Oro: Samtliga områden", and "Partisympati"
@@ -417,12 +1175,7 @@ def build_sections(workbook, charts: Dict[str, List[Dict]]) -> List[Dict]:
         # Reverse chart data if needed
         if needs_reverse and chart_list:
             for chart in chart_list:
-                if chart.get("categories"):
-                    chart["categories"] = list(reversed(chart["categories"]))
-                if chart.get("series"):
-                    for serie in chart["series"]:
-                        if serie.get("values"):
-                            serie["values"] = list(reversed(serie["values"]))
+                chart.reverse()
         
         # Reverse table data if needed (keep header row)
         if needs_reverse and table_data and len(table_data) > 1:
@@ -436,7 +1189,6 @@ def build_sections(workbook, charts: Dict[str, List[Dict]]) -> List[Dict]:
                 "slug": "report",
                 "indicators": [],
             }
-            sections.append(current_section)
 
         # Always include the sheet, even if it has no charts or metadata
         # This ensures all sheets from Excel are included
@@ -516,7 +1268,7 @@ def build_sections(workbook, charts: Dict[str, List[Dict]]) -> List[Dict]:
             "title": display_title,
             "slug": slugify(sheet_name),  # Keep slug based on sheet name for consistency
             "sheet": sheet_name,
-            "charts": chart_list,
+            "charts": [chart.to_dict() for chart in chart_list],
             "table": table_data,  # Include table data if Typ == "Tabell"
             "typ": metadata["typ"],  # Include type field
             "rubrik": metadata["rubrik"],  # Include rubrik field
@@ -525,75 +1277,2066 @@ def build_sections(workbook, charts: Dict[str, List[Dict]]) -> List[Dict]:
             "kommentar": metadata["kommentar"],
             "kalla": metadata["kalla"],  # Include källa field
         }
-        current_section["indicators"].append(indicator)
         processed_sheets.append(sheet_name)
+        yield current_section, indicator
 
-    # Return all sections, but only if they have at least one indicator
-    # This ensures we don't create empty sections, but all sheets are included
-    return [section for section in sections if section["indicators"]]
 
+def build_sections(
+    workbook,
+    charts: Dict[str, List[Dict]],
+    extracted: Optional[Dict[str, Tuple[Dict[str, Optional[str]], Optional[List[List[Union[str, float, None]]]]]]] = None,
+    sheet_names: Optional[List[str]] = None,
+) -> List[Dict]:
+    """Group indicator sheets into sections in workbook order; see ``iter_indicators``.
 
-def export(workbook_path: Path, output_path: Path) -> Dict:
-    wb = load_workbook(workbook_path, data_only=True, keep_vba=True)
-    chart_map: Dict[str, List[Dict]] = defaultdict(list)
+    Only sections with at least one indicator are returned, but every indicator
+    sheet is included."""
+    sections = []
+    for section, indicator in iter_indicators(workbook, charts, extracted, sheet_names):
+        if not sections or sections[-1] is not section:
+            sections.append(section)
+        section["indicators"].append(indicator)
+    return sections
 
-    with zipfile.ZipFile(workbook_path, "r") as archive:
-        chart_files = sorted(
-            name for name in archive.namelist() if name.startswith("xl/charts/chart") and name.endswith(".xml")
-        )
-        for chart_file in chart_files:
-            chart_obj = parse_chart(archive.read(chart_file), wb)
-            if not chart_obj or not chart_obj.get("sheet"):
-                continue
-            chart_obj["id"] = Path(chart_file).stem
-            chart_obj["source"] = chart_file
-            chart_map[chart_obj["sheet"]].append(chart_obj)
 
-    sections = build_sections(wb, chart_map)
-    payload = {
-        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-        "source_workbook": workbook_path.name,
-        "section_count": len(sections),
-        "sections": sections,
-    }
+def compare_chart_data(cached: Dict, from_cells: Dict) -> List[str]:
+    """Describe where a chart built from its caches differs from the same chart built from cells.
 
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    return payload
+    Text cells in number series are expected to be missing from the cache."""
 
+    def same(cached_value, cell_value) -> bool:
+        if isinstance(cached_value, (int, float)) and isinstance(cell_value, (int, float)):
+            return math.isclose(cached_value, cell_value, rel_tol=1e-9, abs_tol=1e-12)
+        if cached_value is None and isinstance(cell_value, str):
+            return True
+        return cached_value == cell_value
 
-def main():
-    parser = argparse.ArgumentParser(description="Export Svenska Trender charts to JSON.")
-    parser.add_argument(
-        "--workbook",
-        type=Path,
-        default=Path("3. Svenska trender 1986-2024.xlsm"),
-        help="Path to the macro-enabled Excel workbook.",
-    )
-    parser.add_argument(
-        "--output",
-        type=Path,
-        default=Path("data/report-data.json"),
-        help="Destination JSON path.",
+    def flatten(values):
+        return [value for row in values for value in row] if values and isinstance(values[0], list) else values or []
+
+    problems = []
+    pairs = [("categories", cached.get("categories"), from_cells.get("categories"))]
+    pairs.extend(
+        (f"series '{a['name']}'", a["values"], b["values"])
+        for a, b in zip(cached.get("series", []), from_cells.get("series", []))
     )
-    args = parser.parse_args()
-    payload = export(args.workbook, args.output)
-    
-    # Debug: list all indicators
-    total_indicators = sum(len(section["indicators"]) for section in payload["sections"])
-    print(f"Wrote {args.output} with {payload['section_count']} sections and {total_indicators} indicators.")
-    
-    # List all sheet names processed
-    all_sheets = []
-    for section in payload["sections"]:
-        for indicator in section["indicators"]:
-            all_sheets.append(indicator["sheet"])
-    
-    # Check for missing sheets
-    wb = load_workbook(args.workbook, data_only=True, keep_vba=True)
-    all_excel_sheets = set(wb.sheetnames)
-    processed_sheets_set = set(all_sheets)
-    missing = all_excel_sheets - processed_sheets_set
+    for label, cached_values, cell_values in pairs:
+        cached_values, cell_values = flatten(cached_values), flatten(cell_values)
+        if len(cached_values) != len(cell_values):
+            problems.append(f"{label} has {len(cached_values)} cached points but {len(cell_values)} cells")
+            continue
+        mismatches = [idx for idx, (a, b) in enumerate(zip(cached_values, cell_values)) if not same(a, b)]
+        if mismatches:
+            problems.append(f"{label} differs at {len(mismatches)} point(s), first at index {mismatches[0]}")
+    return problems
+
+
+def parse_chart_files(
+    archive: zipfile.ZipFile,
+    chart_files: List[str],
+    workbook,
+    chart_source: str = "cells",
+    records: Optional[Dict[str, Dict]] = None,
+) -> List[Tuple[str, Optional[Dict], List[str]]]:
+    """Parse chart parts, reading their referenced ranges with one pass per sheet.
+
+    With ``chart_source="cache"`` the values cached in the chart parts are used
+    and only references without a usable cache are read from the workbook.
+    Returns ``(chart_file, chart, referenced_sheets)`` per part; ``chart`` is None
+    for parts that do not yield a chart with a sheet. ``records`` may hold
+    ``read_chart_xml`` results of parts already read."""
+    known = records or {}
+    records = {}
+    for chart_file in chart_files:
+        if chart_file in known:
+            records[chart_file] = known[chart_file]
+            continue
+        with profile_span(chart_file, "chart-xml"):
+            records[chart_file] = read_chart_xml(archive.read(chart_file))
+    chart_refs = {chart_file: chart_range_refs(record) for chart_file, record in records.items()}
+    ranges = {}
+    if chart_source == "cache":
+        for record in records.values():
+            ranges.update(record["caches"])
+    ranges.update(plan_ranges(workbook, (ref for refs in chart_refs.values() for ref in refs if ref not in ranges)))
+    results = []
+    for chart_file, record in records.items():
+        with profile_span(chart_file, "chart") as span:
+            chart_obj = build_chart(record, workbook, ranges)
+            if span is not None and chart_obj:
+                span["sheet"] = chart_obj.sheet
+        if chart_obj and chart_obj.sheet:
+            chart_obj.id = Path(chart_file).stem
+            chart_obj.source = chart_file
+        else:
+            chart_obj = None
+        referenced_sheets = sorted({ref.split("!")[0].strip("'") for ref in chart_refs[chart_file] if "!" in ref})
+        results.append((chart_file, chart_obj, referenced_sheets))
+    return results
+
+
+# Per-process state for --jobs workers, set up by _init_worker
+_worker_workbook = None
+_worker_archive = None
+
+
+def _init_worker(workbook_path: Path, engine: str) -> None:
+    global _worker_workbook, _worker_archive
+    _worker_workbook = load_report_workbook(workbook_path, engine)
+    if isinstance(_worker_workbook, FastWorkbook):
+        _worker_archive = _worker_workbook.archive
+    else:
+        _worker_archive = zipfile.ZipFile(workbook_path, "r")
+
+
+def _parse_chart_files_task(chart_files: List[str], chart_source: str) -> List[Tuple[str, Optional[Dict], List[str]]]:
+    return parse_chart_files(_worker_archive, chart_files, _worker_workbook, chart_source)
+
+
+def _extract_sheet_task(sheet_name: str):
+    return sheet_name, extract_sheet(_worker_workbook, sheet_name)
+
+
+def workbook_sheets(archive: zipfile.ZipFile) -> List[Tuple[str, str, str]]:
+    """List ``(name, part, relationship_type)`` for the sheets in xl/workbook.xml, in order."""
+    workbook_root = ET.fromstring(archive.read("xl/workbook.xml"))
+    rels_root = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {}
+    for rel in rels_root.findall("rel:Relationship", NS):
+        target = rel.get("Target", "")
+        # Targets are relative to xl/ unless they are absolute package paths
+        part = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+        targets[rel.get("Id")] = (part, rel.get("Type", ""))
+    sheets = []
+    for sheet in workbook_root.findall("main:sheets/main:sheet", NS):
+        target = targets.get(sheet.get(f"{{{NS['r']}}}id"))
+        if target:
+            sheets.append((sheet.get("name"), *target))
+    return sheets
+
+
+def sheet_part_map(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Map sheet names to their worksheet parts via xl/workbook.xml and its relationships."""
+    return {name: part for name, part, _ in workbook_sheets(archive)}
+
+
+def part_relationships(archive: zipfile.ZipFile, part: str) -> List[Tuple[str, str]]:
+    """List ``(target_part, relationship_type)`` from a part's _rels file (empty if it has none)."""
+    folder, name = posixpath.split(part)
+    rels_part = posixpath.join(folder, "_rels", f"{name}.rels")
+    try:
+        rels_root = ET.fromstring(archive.read(rels_part))
+    except KeyError:
+        return []
+    relationships = []
+    for rel in rels_root.findall("rel:Relationship", NS):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        target_part = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(folder, target))
+        relationships.append((target_part, rel.get("Type", "")))
+    return relationships
+
+
+def sheet_chart_parts(archive: zipfile.ZipFile) -> Dict[str, List[str]]:
+    """Map sheet names to the chart parts drawn on them (sheet -> drawing -> chart relationships)."""
+    charts = {}
+    for name, part, _ in workbook_sheets(archive):
+        charts[name] = [
+            chart_part
+            for drawing_part, rel_type in part_relationships(archive, part)
+            if rel_type.endswith("/drawing")
+            for chart_part, chart_type in part_relationships(archive, drawing_part)
+            if chart_type.endswith("/chart")
+        ]
+    return charts
+
+
+def part_hashes(archive: zipfile.ZipFile) -> Dict[str, str]:
+    """Content hashes of the workbook parts the export reads."""
+    hashes = {}
+    for name in archive.namelist():
+        if name.startswith(CACHED_PART_PREFIXES) and name.endswith(".xml"):
+            hashes[name] = hashlib.sha256(archive.read(name)).hexdigest()
+    return hashes
+
+
+def export_cache_key(workbook, hashes: Dict[str, str], chart_source: str = "cells") -> str:
+    """Key for everything in the cache: shared strings, styles, the date epoch, the chart source and this script.
+
+    A change to any of these can alter every extracted value, so it invalidates
+    the whole cache."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(f"chart_source={chart_source};".encode())
+    for name in ("xl/sharedStrings.xml", "xl/styles.xml"):
+        digest.update(f"{name}={hashes.get(name)};".encode())
+    digest.update(str(workbook.epoch).encode())
+    return digest.hexdigest()
+
+
+def cache_path_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.cache.json")
+
+
+def parse_export_cache(text: Optional[str], key: str) -> Dict:
+    """Parse a serialized incremental-export cache, or return an empty one if it is missing or stale."""
+    empty = {"key": key, "sheets": {}, "charts": {}}
+    if text is None:
+        return empty
+    try:
+        cache = json.loads(text)
+    except ValueError:
+        return empty
+    return cache if cache.get("key") == key else empty
+
+
+def load_export_cache(cache_path: Path, key: str) -> Dict:
+    """Load the incremental-export cache, or an empty one if it is missing or stale."""
+    return parse_export_cache(cache_path.read_text(encoding="utf-8") if cache_path.exists() else None, key)
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write ``text`` to ``path`` via a temporary file and a rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def search_tokens(value: Optional[str]) -> List[str]:
+    """Split text into folded search terms, dropping stopwords and single letters."""
+    if not value:
+        return []
+    return [
+        token
+        for token in re.split(r"[^a-z0-9]+", fold_text(str(value)))
+        if (len(token) > 1 or token.isdigit()) and token not in SEARCH_STOPWORDS
+    ]
+
+
+def search_index_path_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.search.json")
+
+
+def build_search_index(payload: Dict) -> Dict:
+    """Build an inverted index of the indicators' texts for client-side search.
+
+    ``docs`` lists ``[section_slug, indicator_slug, title]`` per indicator;
+    ``terms`` is sorted, so a prefix maps to a contiguous range found by binary
+    search, and ``postings[i]`` lists ``[doc, field_bits]`` for ``terms[i]``,
+    where bit ``n`` is set when the term occurs in ``fields[n]``. Terms are
+    folded like ``slugify`` ("Förtroende" -> "fortroende"), and queries should
+    be folded the same way."""
+    docs = []
+    postings = defaultdict(dict)
+    for section in payload["sections"]:
+        for indicator in section["indicators"]:
+            doc = len(docs)
+            docs.append([section["slug"], indicator["slug"], indicator["title"]])
+            texts = dict(indicator, section=section["title"])
+            for bit, field in enumerate(SEARCH_FIELDS):
+                for token in search_tokens(texts.get(field)):
+                    postings[token][doc] = postings[token].get(doc, 0) | (1 << bit)
+    terms = sorted(postings)
+    return {
+        "version": 1,
+        "generated_at": payload["generated_at"],
+        "fields": list(SEARCH_FIELDS),
+        "docs": docs,
+        "terms": terms,
+        "postings": [[[doc, bits] for doc, bits in sorted(postings[term].items())] for term in terms],
+    }
+
+
+def lookup_search_index(index: Dict, query: str) -> List[Tuple[str, str]]:
+    """Look up a query in a ``build_search_index`` index, the way a client would.
+
+    Every query word must match a term as a prefix; hits are ranked by how many
+    words matched in the title, then in workbook order. Returns
+    ``(section_slug, indicator_slug)`` pairs."""
+    scores = None
+    for word in search_tokens(query):
+        matches = {}
+        start = bisect.bisect_left(index["terms"], word)
+        for term_idx in range(start, len(index["terms"])):
+            if not index["terms"][term_idx].startswith(word):
+                break
+            for doc, bits in index["postings"][term_idx]:
+                matches[doc] = max(matches.get(doc, 0), bits & 1)
+        scores = matches if scores is None else {doc: scores[doc] + title for doc, title in matches.items() if doc in scores}
+    if not scores:
+        return []
+    ranked = sorted(scores, key=lambda doc: (-scores[doc], doc))
+    return [tuple(index["docs"][doc][:2]) for doc in ranked]
+
+
+def manifest_path_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.manifest.json")
+
+
+def write_sharded_report(payload: Dict, output_path: Path) -> Dict:
+    """Write the report as a small manifest plus one content-hashed file per indicator.
+
+    Indicators go to ``<output stem>/<slug>.<hash>.json`` as minified JSON, so the
+    files can be served as immutable; only the manifest
+    (``<output stem>.manifest.json``) keeps a fixed name and needs revalidation.
+    It lists sections and indicators with their titles, slugs, types, headings and file,
+    and is written last so it never points at a missing file. Indicator files no
+    longer referenced are removed."""
+    shard_dir = output_path.with_suffix("")
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    written = set()
+    manifest_sections = []
+    for section in payload["sections"]:
+        manifest_indicators = []
+        for indicator in section["indicators"]:
+            body = json.dumps(indicator, ensure_ascii=False, separators=(",", ":"))
+            digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+            shard_path = shard_dir / f"{indicator['slug']}.{digest}.json"
+            if not shard_path.exists():
+                write_text_atomic(shard_path, body)
+            written.add(shard_path.name)
+            entry = {
+                "title": indicator["title"],
+                "slug": indicator["slug"],
+                "sheet": indicator["sheet"],
+                "typ": indicator["typ"],
+                "rubrik": indicator["rubrik"],
+                "underrubrik": indicator["underrubrik"],
+                "chart_types": [chart["type"] for chart in indicator["charts"]],
+                "file": f"{shard_dir.name}/{shard_path.name}",
+            }
+            # With --svg the static charts can be shown before the indicator file is loaded
+            if any("svg" in chart for chart in indicator["charts"]):
+                entry["chart_svgs"] = [chart.get("svg") for chart in indicator["charts"]]
+            manifest_indicators.append(entry)
+        manifest_sections.append({"title": section["title"], "slug": section["slug"], "indicators": manifest_indicators})
+
+    manifest = {
+        "generated_at": payload["generated_at"],
+        "source_workbook": payload["source_workbook"],
+        "section_count": payload["section_count"],
+        "sections": manifest_sections,
+    }
+    write_text_atomic(manifest_path_for(output_path), json.dumps(manifest, ensure_ascii=False, separators=(",", ":")))
+    for stale in shard_dir.glob("*.json*"):
+        # Precompressed siblings (.json.gz/.json.br) go with their indicator file
+        if stale.name[: stale.name.index(".json") + 5] not in written:
+            stale.unlink()
+    return manifest
+
+
+def pack_report(payload: Dict, dtype: str = "float64") -> Tuple[Dict, bytes]:
+    """Split the report into minified-JSON metadata and one packed array of series values.
+
+    Every flat series gets ``values_slice: [offset, length]`` (counted in values,
+    not bytes) into a little-endian float64/float32 array in place of ``values``;
+    anything that is not a number becomes NaN. Categories, tables and series with
+    multi-column values stay in the JSON."""
+    values = array("d" if dtype == "float64" else "f")
+
+    def pack_series(serie: Dict) -> Dict:
+        series_values = serie.get("values")
+        if not isinstance(series_values, list) or any(isinstance(value, list) for value in series_values):
+            return dict(serie)
+        packed = {key: value for key, value in serie.items() if key != "values"}
+        packed["values_slice"] = [len(values), len(series_values)]
+        values.extend(
+            float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+            for value in series_values
+        )
+        return packed
+
+    sections = []
+    for section in payload["sections"]:
+        indicators = []
+        for indicator in section["indicators"]:
+            charts = [dict(chart, series=[pack_series(serie) for serie in chart["series"]]) for chart in indicator["charts"]]
+            indicators.append(dict(indicator, charts=charts))
+        sections.append(dict(section, indicators=indicators))
+    if sys.byteorder != "little":
+        values.byteswap()
+    packed_payload = dict(payload, values_dtype=dtype, sections=sections)
+    return packed_payload, values.tobytes()
+
+
+def packed_path_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.packed.json")
+
+
+def write_packed_report(payload: Dict, output_path: Path, dtype: str = "float64") -> List[Path]:
+    """Write ``pack_report`` output as ``<stem>.packed.json`` plus the ``<stem>.bin`` values file."""
+    packed_payload, values = pack_report(payload, dtype)
+    values_path = output_path.with_suffix(".bin")
+    packed_payload["values_file"] = values_path.name
+    json_path = packed_path_for(output_path)
+    values_path.parent.mkdir(parents=True, exist_ok=True)
+    values_path.write_bytes(values)
+    write_text_atomic(json_path, json.dumps(packed_payload, ensure_ascii=False, separators=(",", ":")))
+    return [json_path, values_path]
+
+
+def remove_other_layouts(output_path: Path, layout: str) -> None:
+    """Delete the files of the layouts other than ``layout``.
+
+    web-report reads the single file if there is one and only then looks for a
+    manifest or packed report, so a leftover from an earlier export must not
+    shadow this one. A sharded or packed export also retracts the patch chain
+    of the single file it replaces. Indicator files of a removed manifest are
+    left in place."""
+    stale = []
+    if layout != "single":
+        stale.append(output_path)
+        unpublish_patches(output_path)
+    if layout != "sharded":
+        stale.append(manifest_path_for(output_path))
+    if layout != "packed":
+        stale += [packed_path_for(output_path), output_path.with_suffix(".bin")]
+    for path in stale:
+        for sibling in (path, path.with_name(f"{path.name}.gz"), path.with_name(f"{path.name}.br")):
+            sibling.unlink(missing_ok=True)
+
+
+def intern_report(payload: Dict) -> Tuple[Dict, Dict]:
+    """Move shared category vectors and repeated texts into a top-level ``interned`` table.
+
+    A chart whose categories occur in more than one chart gets the index of the
+    vector in ``interned.categories`` instead. Texts of ``INTERNED_INDICATOR_FIELDS``
+    and series names that recur get their index into ``interned.strings``, when
+    the references are shorter than the repeated text. The most frequent texts
+    get the lowest indexes. These fields otherwise never hold numbers, so a
+    number always means a reference; ``expand_report`` restores the payload.
+    Returns the interned payload and per-field reference counts."""
+    category_counts = defaultdict(int)
+    string_counts = defaultdict(int)
+    for section in payload["sections"]:
+        for indicator in section["indicators"]:
+            for field in INTERNED_INDICATOR_FIELDS:
+                if isinstance(indicator.get(field), str):
+                    string_counts[indicator[field]] += 1
+            for chart in indicator["charts"]:
+                category_counts[json.dumps(chart["categories"])] += 1
+                for serie in chart["series"]:
+                    if isinstance(serie.get("name"), str):
+                        string_counts[serie["name"]] += 1
+
+    category_ids = {}
+    for key, count in category_counts.items():
+        if count > 1:
+            category_ids[key] = len(category_ids)
+    string_ids = {}
+    # Dicts keep first-occurrence order, so the stable sort breaks ties by it
+    for text in sorted(string_counts, key=lambda text: -string_counts[text]):
+        count = string_counts[text]
+        size = len(json.dumps(text, ensure_ascii=False).encode("utf-8"))
+        if text and (count - 1) * size > count * len(str(len(string_ids))):
+            string_ids[text] = len(string_ids)
+
+    references = defaultdict(int)
+
+    def ref(field: str, value):
+        if isinstance(value, str) and value in string_ids:
+            references[field] += 1
+            return string_ids[value]
+        return value
+
+    sections = []
+    for section in payload["sections"]:
+        indicators = []
+        for indicator in section["indicators"]:
+            charts = []
+            for chart in indicator["charts"]:
+                chart = dict(chart, series=[dict(serie, name=ref("name", serie.get("name"))) for serie in chart["series"]])
+                key = json.dumps(chart["categories"])
+                if key in category_ids:
+                    references["categories"] += 1
+                    chart["categories"] = category_ids[key]
+                charts.append(chart)
+            fields = {field: ref(field, indicator[field]) for field in INTERNED_INDICATOR_FIELDS if field in indicator}
+            indicators.append(dict(indicator, charts=charts, **fields))
+        sections.append(dict(section, indicators=indicators))
+    interned = dict(payload)
+    interned.pop("sections")
+    interned["interned"] = {"categories": [json.loads(key) for key in category_ids], "strings": list(string_ids)}
+    interned["sections"] = sections
+    stats = {
+        "categories": len(category_ids),
+        "strings": len(string_ids),
+        "references": {field: references[field] for field in ("categories", *INTERNED_INDICATOR_FIELDS, "name")},
+    }
+    return interned, stats
+
+
+def expand_report(payload: Dict) -> Dict:
+    """Undo ``intern_report``: replace references by their values (payloads without ``interned`` pass through)."""
+    if "interned" not in payload:
+        return payload
+    categories = payload["interned"]["categories"]
+    strings = payload["interned"]["strings"]
+
+    def value(item):
+        return strings[item] if isinstance(item, int) and not isinstance(item, bool) else item
+
+    sections = []
+    for section in payload["sections"]:
+        indicators = []
+        for indicator in section["indicators"]:
+            charts = [
+                dict(
+                    chart,
+                    categories=categories[chart["categories"]] if isinstance(chart["categories"], int) else chart["categories"],
+                    series=[dict(serie, name=value(serie.get("name"))) for serie in chart["series"]],
+                )
+                for chart in indicator["charts"]
+            ]
+            fields = {field: value(indicator[field]) for field in INTERNED_INDICATOR_FIELDS if field in indicator}
+            indicators.append(dict(indicator, charts=charts, **fields))
+        sections.append(dict(section, indicators=indicators))
+    expanded = {key: item for key, item in payload.items() if key != "interned"}
+    expanded["sections"] = sections
+    return expanded
+
+
+def print_dedup_report(stats: Dict, bytes_before: int, bytes_after: int) -> None:
+    """Print what ``intern_report`` shared and how many bytes of the written report it saved."""
+    print(f"Interned {stats['categories']} category vector(s) and {stats['strings']} string(s):")
+    for field, count in stats["references"].items():
+        if count:
+            print(f"  {field:<14}{count:>6} references")
+    saved = bytes_before - bytes_after
+    print(
+        f"Report size: {bytes_before / 1024:.1f} KiB -> {bytes_after / 1024:.1f} KiB "
+        f"(saved {saved / 1024:.1f} KiB, {saved / bytes_before if bytes_before else 0:.1%})"
+    )
+
+
+def patches_path_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}.patches.json")
+
+
+def keyed_indicators(payload: Dict) -> Tuple[List[List], Dict[str, Dict]]:
+    """Key a report's indicators by slug, like ``merge_editions`` ("slug~2" for repeats).
+
+    Returns the outline (``[section_slug, section_title, [keys]]`` per section)
+    and the indicators by key."""
+    outline = []
+    indicators = {}
+    for section in payload["sections"]:
+        keys = []
+        for indicator in section["indicators"]:
+            key, suffix = indicator["slug"], 2
+            while key in indicators:
+                key, suffix = f"{indicator['slug']}~{suffix}", suffix + 1
+            indicators[key] = indicator
+            keys.append(key)
+        outline.append([section["slug"], section["title"], keys])
+    return outline, indicators
+
+
+def _diff_fields(old: Dict, new: Dict, nested: Optional[str] = None) -> Dict:
+    # "set" holds new or changed fields, "drop" the removed ones; ``nested`` is diffed by the caller
+    diff = {}
+    fields = {key: value for key, value in new.items() if key != nested and (key not in old or not _same(old[key], value))}
+    if fields:
+        diff["set"] = fields
+    dropped = [key for key in old if key != nested and key not in new]
+    if dropped:
+        diff["drop"] = dropped
+    return diff
+
+
+def _diff_items(old: List[Dict], new: List[Dict], nested: Optional[str] = None) -> Dict:
+    # Item-by-item changes when the count is unchanged, else the new list as a whole
+    if len(old) != len(new):
+        return {"replace": new}
+    changes = []
+    for idx, (old_item, new_item) in enumerate(zip(old, new)):
+        diff = _diff_fields(old_item, new_item, nested)
+        if nested == "series":
+            diff.update(_diff_items(old_item["series"], new_item["series"]))
+        if diff:
+            changes.append(dict(diff, index=idx))
+    return {"changes": changes} if changes else {}
+
+
+def diff_reports(old: Dict, new: Dict) -> Dict:
+    """Structural diff from one report payload to the next, per indicator.
+
+    Indicators are matched by key (see ``keyed_indicators``). The patch lists
+    the new outline, the added indicators in full, the removed keys, and for
+    each changed indicator its changed fields plus its chart changes: a chart
+    list or series list whose length changed is replaced whole, otherwise each
+    changed chart and series gets its changed fields by index. Apply it with
+    ``apply_patch``."""
+    _, old_indicators = keyed_indicators(old)
+    outline, new_indicators = keyed_indicators(new)
+    changed = {}
+    for key, indicator in new_indicators.items():
+        if key not in old_indicators:
+            continue
+        diff = _diff_fields(old_indicators[key], indicator, "charts")
+        charts = _diff_items(old_indicators[key]["charts"], indicator["charts"], "series")
+        if charts:
+            diff["charts"] = charts
+        if diff:
+            changed[key] = diff
+    return {
+        "generated_at": new["generated_at"],
+        "source_workbook": new["source_workbook"],
+        "sections": outline,
+        "added": {key: indicator for key, indicator in new_indicators.items() if key not in old_indicators},
+        "removed": [key for key in old_indicators if key not in new_indicators],
+        "changed": changed,
+    }
+
+
+def patch_is_empty(patch: Dict, old: Dict) -> bool:
+    """Whether a ``diff_reports`` patch changes nothing but ``generated_at``."""
+    return (
+        not (patch["added"] or patch["removed"] or patch["changed"])
+        and patch["sections"] == keyed_indicators(old)[0]
+        and patch["source_workbook"] == old["source_workbook"]
+    )
+
+
+def _apply_fields(item: Dict, diff: Dict) -> Dict:
+    item = {key: value for key, value in item.items() if key not in diff.get("drop", ())}
+    item.update(diff.get("set", {}))
+    return item
+
+
+def _apply_items(items: List[Dict], diff: Dict, nested: Optional[str] = None) -> List[Dict]:
+    if "replace" in diff:
+        return diff["replace"]
+    items = list(items)
+    for change in diff.get("changes", ()):
+        item = _apply_fields(items[change["index"]], change)
+        if nested == "series":
+            item["series"] = _apply_items(item["series"], change)
+        items[change["index"]] = item
+    return items
+
+
+def apply_patch(report: Dict, patch: Dict) -> Dict:
+    """Apply a ``diff_reports`` patch to the report it was made from."""
+    _, indicators = keyed_indicators(report)
+    for key, diff in patch["changed"].items():
+        indicator = _apply_fields(indicators[key], diff)
+        if "charts" in diff:
+            indicator["charts"] = _apply_items(indicator["charts"], diff["charts"], "series")
+        indicators[key] = indicator
+    indicators.update(patch["added"])
+    sections = [
+        {"title": title, "slug": slug, "indicators": [indicators[key] for key in keys]}
+        for slug, title, keys in patch["sections"]
+    ]
+    patched = {key: value for key, value in report.items() if key != "sections"}
+    patched.update(
+        generated_at=patch["generated_at"], source_workbook=patch["source_workbook"], section_count=len(sections)
+    )
+    if "to_version" in patch:
+        patched["version"] = patch["to_version"]
+    patched["sections"] = sections
+    return patched
+
+
+def with_version(payload: Dict, version: int) -> Dict:
+    """The payload with a ``version`` field, placed before its sections."""
+    versioned = {key: value for key, value in payload.items() if key not in ("version", "sections")}
+    versioned["version"] = version
+    versioned["sections"] = payload["sections"]
+    return versioned
+
+
+def publish_patch(previous: Optional[Dict], payload: Dict, output_path: Path, keep: int = 5) -> Tuple[Dict, List[Path]]:
+    """Version a report against the previously published one and write the patch between them.
+
+    ``previous`` is the (expanded) report last written to ``output_path``. When
+    it has a version and differs from ``payload``, the ``diff_reports`` patch
+    goes to ``<stem>.v<version>.patch.json`` (immutable, minified) and the
+    version is bumped; an unchanged report keeps its version. Without a
+    versioned previous report a new chain starts. ``<stem>.patches.json`` lists
+    the current version and the last ``keep`` patches, which always form one
+    chain ending at it; older patch files are removed. Returns the payload with
+    its ``version`` and the written files."""
+    manifest_path = patches_path_for(output_path)
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+    chain = manifest.get("patches", [])
+    old_version = previous.get("version") if previous else None
+    written = []
+    if old_version is None:
+        # Never reuse a number a client may still hold
+        version, chain = (manifest.get("version") or manifest.get("last_version") or 0) + 1, []
+    else:
+        patch = diff_reports(previous, payload)
+        if patch_is_empty(patch, previous):
+            version = old_version
+        else:
+            version = old_version + 1
+            patch = dict(from_version=old_version, to_version=version, **patch)
+            patch_path = output_path.with_name(f"{output_path.stem}.v{version}.patch.json")
+            write_text_atomic(patch_path, json.dumps(patch, ensure_ascii=False, separators=(",", ":")))
+            written.append(patch_path)
+            # A report replaced by other means (e.g. without --patches) breaks the chain
+            if manifest.get("version") != old_version:
+                chain = []
+            chain = chain + [
+                {"from": old_version, "to": version, "file": patch_path.name, "bytes": patch_path.stat().st_size}
+            ]
+    chain = chain[-keep:] if keep > 0 else []
+
+    kept = {entry["file"] for entry in chain}
+    for stale in output_path.parent.glob(f"{glob.escape(output_path.stem)}.v*.patch.json*"):
+        if stale.name[: stale.name.index(".patch.json") + 11] not in kept:
+            stale.unlink()
+    manifest = {"version": version, "generated_at": payload["generated_at"], "patches": chain}
+    write_text_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2))
+    written.append(manifest_path)
+    return with_version(payload, version), written
+
+
+def unpublish_patches(output_path: Path) -> None:
+    """Retract the patches of a report rewritten without them, as their version no longer applies.
+
+    The manifest keeps the last version as ``last_version``, so the next chain
+    continues the numbering."""
+    manifest_path = patches_path_for(output_path)
+    if not manifest_path.exists():
+        return
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    if manifest.get("version") is None:
+        return
+    manifest = {"version": None, "last_version": manifest["version"], "patches": []}
+    write_text_atomic(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2))
+
+
+def print_report_diff(old: Dict, new: Dict) -> None:
+    """Print the indicators, charts and series that differ between two report payloads."""
+    patch = diff_reports(old, new)
+    _, old_indicators = keyed_indicators(old)
+    _, new_indicators = keyed_indicators(new)
+    for key, diff in patch["changed"].items():
+        indicator = new_indicators[key]
+        fields = [*diff.get("set", {}), *diff.get("drop", ())]
+        print(f"~ {indicator['sheet']} ({key})" + (f": {', '.join(fields)}" if fields else ""))
+        charts = diff.get("charts", {})
+        if "replace" in charts:
+            print(f"    charts replaced: {len(old_indicators[key]['charts'])} -> {len(charts['replace'])}")
+        for change in charts.get("changes", ()):
+            chart = indicator["charts"][change["index"]]
+            fields = [*change.get("set", {}), *change.get("drop", ())]
+            details = [", ".join(fields)] if fields else []
+            if "replace" in change:
+                details.append(f"series replaced: {', '.join(repr(serie['name']) for serie in change['replace'])}")
+            for serie_change in change.get("changes", ()):
+                serie = chart["series"][serie_change["index"]]
+                serie_fields = [*serie_change.get("set", {}), *serie_change.get("drop", ())]
+                details.append(f"series {serie['name']!r}: {', '.join(serie_fields)}")
+            print(f"    chart {change['index'] + 1} {chart.get('title') or ''}: {'; '.join(details)}")
+    for key, indicator in patch["added"].items():
+        print(f"+ {indicator['sheet']} ({key})")
+    for key in patch["removed"]:
+        print(f"- {old_indicators[key]['sheet']} ({key})")
+    moved = patch["sections"] != keyed_indicators(old)[0]
+    print(
+        f"{len(patch['changed'])} changed, {len(patch['added'])} added, {len(patch['removed'])} removed "
+        f"of {len(new_indicators)} indicators" + ("; sections or order changed" if moved else "")
+    )
+
+
+def svg_ticks(low: float, high: float, count: int = 5) -> List[float]:
+    """About ``count`` evenly spaced round tick values covering ``low``..``high``."""
+    raw_step = (high - low) / max(count - 1, 1) or 1.0
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    step = next(factor * magnitude for factor in (1, 2, 2.5, 5, 10) if factor * magnitude >= raw_step)
+    first = math.floor(low / step) * step
+    last = math.ceil(high / step) * step
+    return [clean_float(first + idx * step) for idx in range(int(round((last - first) / step)) + 1)]
+
+
+def svg_label(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return "" if value is None else str(value)
+
+
+def render_chart_svg(chart: Dict, percent: bool = True) -> Optional[str]:
+    """Draw a chart dict as a static SVG; None for types other than line, bar and area.
+
+    Mirrors the interactive chart of web-report: the value axis spans 0-100
+    (-50-50 with negative values) unless the data goes beyond, gaps are
+    bridged, and each series ends in a "value% name" label (``percent=False``
+    drops the %). Series of a combo chart use their own type when it is one
+    of these; multi-column series are left out."""
+    series = []
+    for serie in chart["series"]:
+        values = serie["values"]
+        serie_type = serie.get("type") if serie.get("type") in SVG_TYPES else chart["type"]
+        if serie_type not in SVG_TYPES or any(isinstance(value, list) for value in values):
+            continue
+        series.append((svg_label(serie["name"]), serie_type, [value if is_number(value) else None for value in values]))
+    numbers = [value for _, _, values in series for value in values if value is not None]
+    if not numbers:
+        return None
+    categories = chart["categories"] or []
+    count = max(len(categories), *(len(values) for _, _, values in series))
+
+    low, high = (-50, 50) if min(numbers) < 0 else (0, 100)
+    ticks = svg_ticks(min(low, min(numbers)), max(high, max(numbers)))
+    top, right, bottom, left = SVG_MARGIN
+    plot_width = SVG_WIDTH - left - right
+    plot_height = SVG_HEIGHT - top - bottom
+    band = plot_width / count
+
+    def x_at(idx: int) -> float:
+        return left + (idx + 0.5) * band
+
+    def y_at(value: float) -> float:
+        return top + (ticks[-1] - value) / (ticks[-1] - ticks[0]) * plot_height
+
+    baseline = y_at(min(max(0, ticks[0]), ticks[-1]))
+    title = svg_label(chart.get("title"))
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {SVG_WIDTH} {SVG_HEIGHT}" '
+        f'width="{SVG_WIDTH}" height="{SVG_HEIGHT}" role="img" aria-label={quoteattr(title)} '
+        'font-family="system-ui, sans-serif" font-size="14">',
+        f"<title>{escape(title)}</title>",
+    ]
+    for tick in ticks:
+        y = y_at(tick)
+        parts.append(f'<line x1="{left}" y1="{y:.1f}" x2="{left + plot_width}" y2="{y:.1f}" stroke="#E5E7EB"/>')
+        parts.append(f'<text x="{left - 8}" y="{y + 5:.1f}" fill="#6B7280" text-anchor="end">{svg_label(tick)}</text>')
+    parts.append(
+        f'<line x1="{left}" y1="{top + plot_height}" x2="{left + plot_width}" y2="{top + plot_height}" stroke="#D1D5DB"/>'
+    )
+    # Roughly one category label per 56 pixels
+    label_every = max(1, math.ceil(count / max(1, plot_width // 56)))
+    for idx in range(0, count, label_every):
+        label = svg_label(categories[idx]) if idx < len(categories) else ""
+        parts.append(
+            f'<text x="{x_at(idx):.1f}" y="{top + plot_height + 24}" fill="#6B7280" text-anchor="middle">{escape(label)}</text>'
+        )
+
+    # Bars of the series stand side by side within each category's band
+    bar_width = band * 0.8 / max(1, sum(serie_type == "bar" for _, serie_type, _ in series))
+    bar_idx = 0
+    for serie_idx, (name, serie_type, values) in enumerate(series):
+        color = SVG_PALETTE[serie_idx % len(SVG_PALETTE)]
+        points = [(x_at(idx), y_at(value), value) for idx, value in enumerate(values) if value is not None]
+        if not points:
+            continue
+        if serie_type == "bar":
+            offset = -band * 0.4 + bar_idx * bar_width
+            bar_idx += 1
+            points = [(x + offset + bar_width / 2, y, value) for x, y, value in points]
+            for x, y, _ in points:
+                parts.append(
+                    f'<rect x="{x - bar_width / 2:.1f}" y="{min(y, baseline):.1f}" width="{bar_width:.1f}" '
+                    f'height="{abs(baseline - y):.1f}" fill="{color}"/>'
+                )
+        else:
+            path = " ".join(f"{'M' if idx == 0 else 'L'}{x:.1f} {y:.1f}" for idx, (x, y, _) in enumerate(points))
+            if serie_type == "area":
+                parts.append(
+                    f'<path d="{path} L{points[-1][0]:.1f} {baseline:.1f} L{points[0][0]:.1f} {baseline:.1f} Z" '
+                    f'fill="{color}" fill-opacity="0.2"/>'
+                )
+            parts.append(f'<path d="{path}" fill="none" stroke="{color}" stroke-width="2.5"/>')
+            parts.extend(
+                f'<circle cx="{x:.1f}" cy="{y:.1f}" r="4" fill="{color}" stroke="#fff" stroke-width="2"/>'
+                for x, y, _ in points
+            )
+        x, y, value = points[-1]
+        # The same small spread as the interactive labels, against exact overlap
+        label_y = y + 5 + (serie_idx - (len(series) - 1) / 2) * 3
+        label = f"{round(value)}{'%' if percent else ''} {name}".strip()
+        parts.append(
+            f'<text x="{x + 8:.1f}" y="{label_y:.1f}" fill="{color}" font-weight="500">{escape(label)}</text>'
+        )
+    parts.append("</svg>")
+    return "\n".join(parts) + "\n"
+
+
+def chart_svg_key(chart: Dict, percent: bool = True) -> str:
+    """Hash of everything ``render_chart_svg`` draws, naming the chart's cached SVG file."""
+    drawn = [
+        SVG_RENDER_VERSION,
+        percent,
+        chart.get("title"),
+        chart["type"],
+        chart["categories"],
+        [[serie["name"], serie.get("type"), serie["values"]] for serie in chart["series"]],
+    ]
+    return hashlib.sha256(json.dumps(drawn, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def svg_dir_for(output_path: Path) -> Path:
+    return output_path.with_name(f"{output_path.stem}-charts")
+
+
+def write_chart_svgs(payload: Dict, output_path: Path) -> List[Path]:
+    """Give every drawable chart of the report a static SVG, referenced from the chart as ``svg``.
+
+    SVGs go to ``<output stem>-charts/<hash>.svg``, named by ``chart_svg_key``,
+    so a chart whose data is unchanged keeps its file and is not redrawn; the
+    ``svg`` path is relative to the output's directory. Files no longer
+    referenced are removed. Returns the referenced files."""
+    svg_dir = svg_dir_for(output_path)
+    svg_dir.mkdir(parents=True, exist_ok=True)
+    referenced = {}
+    for section in payload["sections"]:
+        for indicator in section["indicators"]:
+            percent = "partiledarpopularitet" not in (indicator["title"] or "").lower()
+            for chart in indicator["charts"]:
+                chart.pop("svg", None)
+                svg_path = svg_dir / f"{chart_svg_key(chart, percent)}.svg"
+                if not svg_path.exists():
+                    svg = render_chart_svg(chart, percent)
+                    if svg is None:
+                        continue
+                    write_text_atomic(svg_path, svg)
+                chart["svg"] = f"{svg_dir.name}/{svg_path.name}"
+                referenced[svg_path.name] = svg_path
+    for stale in svg_dir.glob("*.svg*"):
+        # Precompressed siblings (.svg.gz/.svg.br) go with their SVG
+        if stale.name[: stale.name.index(".svg") + 4] not in referenced:
+            stale.unlink()
+    return list(referenced.values())
+
+
+def write_precompressed(path: Path) -> None:
+    """Write ``.gz`` and, when brotli is installed, ``.br`` siblings of ``path`` for static hosting."""
+    data = path.read_bytes()
+    path.with_name(f"{path.name}.gz").write_bytes(gzip.compress(data, compresslevel=9, mtime=0))
+    if brotli is not None:
+        path.with_name(f"{path.name}.br").write_bytes(brotli.compress(data, quality=11))
+
+
+# Columns of the long-format tables written by --format sqlite/csv/parquet
+INDICATOR_COLUMNS = (
+    "section",
+    "section_title",
+    "indicator_slug",
+    "sheet",
+    "title",
+    "typ",
+    "rubrik",
+    "underrubrik",
+    "fraga",
+    "kommentar",
+    "kalla",
+    "chart_count",
+    "has_table",
+)
+CHART_COLUMNS = ("section", "indicator_slug", "chart_id", "title", "type", "sheet", "source")
+POINT_COLUMNS = (
+    "section",
+    "indicator_slug",
+    "chart_id",
+    "series_name",
+    "series_type",
+    "position",
+    "category",
+    "year",
+    "value",
+)
+
+
+def category_text(category) -> Optional[str]:
+    if category is None:
+        return None
+    if isinstance(category, list):
+        return " / ".join(str(part) for part in category if part is not None)
+    if isinstance(category, float) and category.is_integer():
+        return str(int(category))
+    return str(category)
+
+
+def category_year(category) -> Optional[int]:
+    """The year a category stands for: an integral number or a four-digit string such as "2024"."""
+    if is_number(category) and float(category).is_integer() and 1000 <= category <= 9999:
+        return int(category)
+    if isinstance(category, str) and re.fullmatch(r"\s*\d{4}\s*", category):
+        return int(category)
+    return None
+
+
+def report_tables(payload: Dict) -> Dict[str, Tuple[Tuple[str, ...], List[Tuple]]]:
+    """Flatten the report into ``indicators``, ``charts`` and a long ``points`` table.
+
+    Each point row holds one series value with its category; ``value`` is the
+    number, or NULL for a missing value (e.g. ".." in the workbook). Series
+    with multi-column values are left out of ``points``."""
+    indicators, charts, points = [], [], []
+    for section in payload["sections"]:
+        for indicator in section["indicators"]:
+            indicators.append(
+                (section["slug"], section["title"], indicator["slug"], indicator["sheet"])
+                + tuple(indicator.get(field) for field in INDICATOR_COLUMNS[4:11])
+                + (len(indicator["charts"]), int(bool(indicator.get("table"))))
+            )
+            for chart in indicator["charts"]:
+                chart_id = chart.get("id")
+                charts.append(
+                    (section["slug"], indicator["slug"], chart_id, chart.get("title"), chart.get("type"), chart.get("sheet"), chart.get("source"))
+                )
+                categories = chart.get("categories") if isinstance(chart.get("categories"), list) else []
+                for serie in chart["series"]:
+                    values = serie.get("values") or []
+                    if any(isinstance(value, list) for value in values):
+                        continue
+                    for position, value in enumerate(values):
+                        category = categories[position] if position < len(categories) else None
+                        points.append(
+                            (
+                                section["slug"],
+                                indicator["slug"],
+                                chart_id,
+                                serie.get("name"),
+                                serie.get("type", chart.get("type")),
+                                position,
+                                category_text(category),
+                                category_year(category),
+                                value if is_number(value) else None,
+                            )
+                        )
+    return {
+        "indicators": (INDICATOR_COLUMNS, indicators),
+        "charts": (CHART_COLUMNS, charts),
+        "points": (POINT_COLUMNS, points),
+    }
+
+
+def write_sqlite_report(payload: Dict, path: Path) -> Path:
+    """Write the ``report_tables`` tables, plus a ``report`` key/value table, to a SQLite file.
+
+    ``points`` is indexed on the indicator slug, the category and the year."""
+    column_types = {"chart_count": "INTEGER", "has_table": "INTEGER", "position": "INTEGER", "year": "INTEGER", "value": "REAL"}
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        with connection:
+            connection.execute("CREATE TABLE report (key TEXT PRIMARY KEY, value TEXT)")
+            connection.executemany(
+                "INSERT INTO report VALUES (?, ?)",
+                [(key, str(payload[key])) for key in ("generated_at", "source_workbook", "section_count")],
+            )
+            for table, (columns, rows) in report_tables(payload).items():
+                definition = ", ".join(f"{column} {column_types.get(column, 'TEXT')}" for column in columns)
+                connection.execute(f"CREATE TABLE {table} ({definition})")
+                connection.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(columns))})", rows)
+            connection.execute("CREATE INDEX indicators_slug ON indicators (indicator_slug)")
+            connection.execute("CREATE INDEX charts_slug ON charts (indicator_slug)")
+            connection.execute("CREATE INDEX points_slug ON points (indicator_slug, chart_id, series_name)")
+            connection.execute("CREATE INDEX points_category ON points (category)")
+            connection.execute("CREATE INDEX points_year ON points (year)")
+    finally:
+        connection.close()
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_csv_report(payload: Dict, output_path: Path) -> List[Path]:
+    """Write the ``report_tables`` tables as ``<stem>.<table>.csv`` files (UTF-8 with BOM, for Excel)."""
+    written = []
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    for table, (columns, rows) in report_tables(payload).items():
+        path = output_path.with_name(f"{output_path.stem}.{table}.csv")
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8-sig", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(columns)
+            writer.writerows(rows)
+        os.replace(tmp_path, path)
+        written.append(path)
+    return written
+
+
+def write_parquet_report(payload: Dict, output_path: Path) -> List[Path]:
+    """Write the ``report_tables`` tables as ``<stem>.<table>.parquet`` files (requires pyarrow)."""
+    written = []
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    for table, (columns, rows) in report_tables(payload).items():
+        path = output_path.with_name(f"{output_path.stem}.{table}.parquet")
+        data = {column: [row[idx] for row in rows] for idx, column in enumerate(columns)}
+        pyarrow.parquet.write_table(pyarrow.table(data), path)
+        written.append(path)
+    return written
+
+
+def build_report(
+    workbook_path: Path,
+    workbook,
+    jobs: int = 1,
+    cache_path: Optional[Path] = None,
+    engine: str = "openpyxl",
+    chart_source: str = "cells",
+    verify_sample: int = 3,
+    memory_cache: Optional[Dict] = None,
+    sheets: Optional[List[str]] = None,
+    chart_files: Optional[List[str]] = None,
+) -> Dict:
+    """Extract the report payload from an opened workbook; see ``export`` for the options.
+
+    With a ``cache_path``, unchanged sheets and charts are reused from that
+    incremental-export cache and the cache is rewritten. A ``memory_cache`` dict
+    does the same without touching the disk, holding the serialized cache under
+    "text" (serialized because build_sections reorders some charts in place).
+
+    ``sheets`` restricts the report to those indicator sheets (under their
+    sections) and ``chart_files`` to those chart parts; only these are read."""
+    chart_map: Dict[str, List[Dict]] = defaultdict(list)
+    indicator_sheets = [
+        name for name in workbook.sheetnames if not is_section_name(name) and (sheets is None or name in sheets)
+    ]
+
+    with workbook_archive(workbook_path, workbook) as archive:
+        if chart_files is None:
+            chart_files = sorted(
+                name for name in archive.namelist() if name.startswith("xl/charts/chart") and name.endswith(".xml")
+            )
+        chart_results = {}
+        extracted = {}
+        use_cache = cache_path is not None or memory_cache is not None
+        if use_cache:
+            with profile_span("hash_parts"):
+                hashes = part_hashes(archive)
+            sheet_hashes = {name: hashes.get(part) for name, part in sheet_part_map(archive).items()}
+            cache_key = export_cache_key(workbook, hashes, chart_source)
+            if memory_cache is not None:
+                cache = parse_export_cache(memory_cache.get("text"), cache_key)
+            else:
+                cache = load_export_cache(cache_path, cache_key)
+            for chart_file in chart_files:
+                entry = cache["charts"].get(chart_file)
+                if (
+                    entry
+                    and entry["hash"] == hashes.get(chart_file)
+                    and all(sheet_hashes.get(name) == digest for name, digest in entry["sheets"].items())
+                ):
+                    chart_results[chart_file] = Chart.from_dict(entry["chart"]) if entry["chart"] else None
+            for sheet_name in indicator_sheets:
+                entry = cache["sheets"].get(sheet_name)
+                if entry and entry["hash"] == sheet_hashes.get(sheet_name):
+                    extracted[sheet_name] = (entry["metadata"], entry["table"])
+
+        pending_charts = [name for name in chart_files if name not in chart_results]
+        pending_sheets = [name for name in indicator_sheets if name not in extracted]
+        parsed = []
+        if jobs > 1 and (pending_charts or pending_sheets):
+            # Contiguous chunks keep charts of the same sheet together, so each
+            # worker still reads a sheet's ranges in one pass
+            chunk_size = max(1, -(-len(pending_charts) // (jobs * 4)))
+            chunks = [pending_charts[i:i + chunk_size] for i in range(0, len(pending_charts), chunk_size)]
+            with profile_span("worker_pool", jobs=jobs), ProcessPoolExecutor(
+                max_workers=jobs, initializer=_init_worker, initargs=(workbook_path, engine)
+            ) as pool:
+                # Alternate chart chunks and sheets in the queue so both kinds of work run side by side
+                chart_futures, sheet_futures = [], []
+                for chunk, sheet_name in zip_longest(chunks, pending_sheets):
+                    if chunk is not None:
+                        chart_futures.append(pool.submit(_parse_chart_files_task, chunk, chart_source))
+                    if sheet_name is not None:
+                        sheet_futures.append(pool.submit(_extract_sheet_task, sheet_name))
+                wait(chart_futures + sheet_futures)
+                parsed = [result for future in chart_futures for result in future.result()]
+                extracted.update(future.result() for future in sheet_futures)
+        else:
+            with profile_span("parse_charts", charts=len(pending_charts)):
+                parsed = parse_chart_files(archive, pending_charts, workbook, chart_source)
+            with profile_span("extract_sheets", sheets=len(pending_sheets)):
+                extracted.update((name, extract_sheet(workbook, name)) for name in pending_sheets)
+        for chart_file, chart_obj, _ in parsed:
+            chart_results[chart_file] = chart_obj
+
+        if chart_source == "cache" and verify_sample > 0:
+            # Check an evenly spread sample of freshly parsed charts against the cells
+            parsed_charts = [chart_file for chart_file, chart_obj, _ in parsed if chart_obj]
+            step = max(1, len(parsed_charts) // verify_sample)
+            sample = parsed_charts[::step][:verify_sample]
+            with profile_span("verify_sample", charts=len(sample)):
+                checked = parse_chart_files(archive, sample, workbook)
+            for chart_file, cell_chart, _ in checked:
+                problems = compare_chart_data(chart_results[chart_file].to_dict(), cell_chart.to_dict() if cell_chart else {})
+                if problems:
+                    print(f"WARNING: Cached values in {chart_file} disagree with the workbook: {'; '.join(problems)}")
+
+        if use_cache:
+            # Write the cache before build_sections, which reorders some charts in place
+            charts_cache = {
+                chart_file: cache["charts"][chart_file] for chart_file in chart_files if chart_file not in pending_charts
+            }
+            for chart_file, chart_obj, referenced_sheets in parsed:
+                charts_cache[chart_file] = {
+                    "hash": hashes.get(chart_file),
+                    "sheets": {name: sheet_hashes.get(name) for name in referenced_sheets},
+                    "chart": chart_obj.to_dict() if chart_obj else None,
+                }
+            sheets_cache = {
+                name: {"hash": sheet_hashes.get(name), "metadata": metadata, "table": table_data}
+                for name, (metadata, table_data) in extracted.items()
+            }
+            with profile_span("write_cache"):
+                cache_text = json.dumps(
+                    {"key": cache["key"], "sheets": sheets_cache, "charts": charts_cache}, ensure_ascii=False
+                )
+                if memory_cache is not None:
+                    memory_cache["text"] = cache_text
+                else:
+                    cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    cache_path.write_text(cache_text, encoding="utf-8")
+
+    for chart_file in chart_files:
+        chart_obj = chart_results[chart_file]
+        if chart_obj and (sheets is None or chart_obj.sheet in sheets):
+            chart_map[chart_obj.sheet].append(chart_obj)
+
+    sheet_names = None
+    if sheets is not None:
+        sheet_names = [name for name in workbook.sheetnames if is_section_name(name) or name in sheets]
+    with profile_span("build_sections"):
+        sections = build_sections(workbook, chart_map, extracted, sheet_names)
+    payload = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "source_workbook": workbook_path.name,
+        "section_count": len(sections),
+        "sections": sections,
+    }
+    return payload
+
+
+def count_sections(sheet_names: List[str]) -> int:
+    """Number of sections ``build_sections`` returns for these sheets, without reading them."""
+    sections = set()
+    current_section = None
+    for sheet_name in sheet_names:
+        if is_section_name(sheet_name):
+            current_section = sheet_name
+        else:
+            sections.add(current_section)
+    return len(sections)
+
+
+def chart_sheet(record: Dict) -> Optional[str]:
+    """The sheet ``build_chart`` attributes a ``read_chart_xml`` record to, without reading values."""
+    placeholders = {ref: ([], normalize_ref(ref)[0]) for ref in chart_range_refs(record)}
+    chart = build_chart(record, None, placeholders)
+    return chart.sheet if chart else None
+
+
+def write_report_stream(output_path: Path, header: Dict, indicators: Iterable[Tuple[Dict, Dict]]) -> Dict:
+    """Write a report one indicator at a time; the file matches ``json.dumps(payload, indent=2)``.
+
+    ``header`` holds the top-level fields before "sections" (its section_count
+    must be known up front, see ``count_sections``) and ``indicators`` yields
+    ``(section, indicator)`` as ``iter_indicators`` does. Only the current
+    indicator is held in memory; the file appears by atomic rename once
+    complete. Returns the header with an outline of the sections (title, slug
+    and each indicator's slug, sheet and title)."""
+    outline = dict(header, sections=[])
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        handle.write("{\n")
+        for key, value in header.items():
+            handle.write(f"  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n")
+        handle.write('  "sections": [')
+        current_section = None
+        for section, indicator in indicators:
+            if section is not current_section:
+                if current_section is not None:
+                    handle.write("\n      ]\n    },")
+                current_section = section
+                handle.write(
+                    f"\n    {{\n      \"title\": {json.dumps(section['title'], ensure_ascii=False)},"
+                    f"\n      \"slug\": {json.dumps(section['slug'], ensure_ascii=False)},"
+                    '\n      "indicators": ['
+                )
+                outline["sections"].append({"title": section["title"], "slug": section["slug"], "indicators": []})
+            else:
+                handle.write(",")
+            handle.write("\n        " + json.dumps(indicator, ensure_ascii=False, indent=2).replace("\n", "\n        "))
+            outline["sections"][-1]["indicators"].append(
+                {"slug": indicator["slug"], "sheet": indicator["sheet"], "title": indicator["title"]}
+            )
+        handle.write("\n      ]\n    }\n  ]\n}" if current_section is not None else "]\n}")
+    os.replace(tmp_path, output_path)
+    return outline
+
+
+def stream_report(
+    workbook_path: Path,
+    output_path: Path,
+    workbook,
+    chart_source: str = "cells",
+    verify_sample: int = 3,
+) -> Dict:
+    """Export with memory bounded by the largest indicator rather than the whole report.
+
+    Chart parts are read up front only to learn which sheet each belongs to;
+    their values are read, and each sheet extracted, when ``iter_indicators``
+    reaches the sheet, and every indicator is written by
+    ``write_report_stream`` and dropped. The file is the same as ``export``
+    writes with ``layout="single"``; returns the outline from
+    ``write_report_stream``. With ``chart_source="cache"`` each chart's cached
+    values are held until its sheet is reached, and the first
+    ``verify_sample`` charts are checked against the cells."""
+    with workbook_archive(workbook_path, workbook) as archive:
+        chart_files = sorted(
+            name for name in archive.namelist() if name.startswith("xl/charts/chart") and name.endswith(".xml")
+        )
+        records = {}
+        sheet_charts = defaultdict(list)
+        for chart_file in chart_files:
+            record = read_chart_xml(archive.read(chart_file))
+            if chart_source != "cache":
+                record["caches"] = {}
+            owner = chart_sheet(record)
+            if owner:
+                records[chart_file] = record
+                sheet_charts[owner].append(chart_file)
+        unverified = verify_sample if chart_source == "cache" else 0
+
+        def load_charts(sheet_name: str) -> List[Dict]:
+            nonlocal unverified
+            files = sheet_charts.pop(sheet_name, [])
+            parsed = parse_chart_files(
+                archive, files, workbook, chart_source, {chart_file: records.pop(chart_file) for chart_file in files}
+            )
+            charts = [chart_obj for _, chart_obj, _ in parsed if chart_obj]
+            if unverified > 0 and charts:
+                # Check the first verify_sample charts against the cells
+                sample = charts[:unverified]
+                unverified -= len(sample)
+                checked = parse_chart_files(archive, [chart_obj.source for chart_obj in sample], workbook)
+                for chart_obj, (chart_file, cell_chart, _) in zip(sample, checked):
+                    problems = compare_chart_data(chart_obj.to_dict(), cell_chart.to_dict() if cell_chart else {})
+                    if problems:
+                        print(f"WARNING: Cached values in {chart_file} disagree with the workbook: {'; '.join(problems)}")
+            return charts
+
+        header = {
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "source_workbook": workbook_path.name,
+            "section_count": count_sections(workbook.sheetnames),
+        }
+        with profile_span("stream"):
+            return write_report_stream(output_path, header, iter_indicators(workbook, load_charts))
+
+
+def export(
+    workbook_path: Path,
+    output_path: Path,
+    workbook=None,
+    jobs: int = 1,
+    incremental: bool = False,
+    engine: str = "openpyxl",
+    chart_source: str = "cells",
+    verify_sample: int = 3,
+    layout: str = "single",
+    value_dtype: str = "float64",
+    precompress: bool = False,
+    search_index: bool = False,
+    formats: Iterable[str] = ("json",),
+    stream: bool = False,
+    intern: bool = False,
+    patches: int = 0,
+    svg: bool = False,
+    overview: bool = False,
+) -> Dict:
+    """Export charts and sheet metadata to JSON.
+
+    Pass an already opened ``workbook`` (see ``load_report_workbook``) to share
+    one load with the caller; otherwise the workbook is opened and closed here.
+    With ``jobs`` > 1, chart parsing and per-sheet extraction run in that many
+    worker processes; the output is the same as a serial run. With
+    ``incremental``, sheets and charts whose workbook parts are unchanged since
+    the last incremental run are taken from a cache next to ``output_path``.
+    ``engine`` selects the reader used when ``workbook`` is not given and by
+    worker processes (see ``load_report_workbook``). With ``chart_source="cache"``
+    chart values come from the caches embedded in the chart parts, and up to
+    ``verify_sample`` of those charts are checked against the cells. With
+    ``layout="sharded"`` the report is written by ``write_sharded_report``
+    instead of as one file, and with ``layout="packed"`` by
+    ``write_packed_report`` using ``value_dtype``. With ``search_index``, a
+    ``build_search_index`` index is written next to the output, and with
+    ``overview`` the ``build_overview`` summaries and sparklines. ``formats``
+    picks the outputs: "json" (per ``layout``), and long-format "sqlite"
+    (``<stem>.sqlite``), "csv" or "parquet" tables next to it. With
+    ``precompress``, every written JSON file also gets .gz/.br siblings. With
+    ``stream``, the single-file JSON report is written by ``stream_report``
+    (serially, without the cache or other outputs) and its outline returned.
+    With ``intern``, the single-file JSON report is written through
+    ``intern_report`` and a dedup report printed; the returned payload is not
+    interned. With ``patches`` > 0, the single-file JSON report is versioned
+    against the one it replaces and the patch between them published, keeping
+    that many patches (see ``publish_patch``). With ``svg``, every chart gets a
+    static SVG by ``write_chart_svgs`` before the report is written."""
+    if workbook is None:
+        with profile_span("load"):
+            wb = load_report_workbook(workbook_path, engine)
+        try:
+            return export(
+                workbook_path,
+                output_path,
+                wb,
+                jobs=jobs,
+                incremental=incremental,
+                engine=engine,
+                chart_source=chart_source,
+                verify_sample=verify_sample,
+                layout=layout,
+                value_dtype=value_dtype,
+                precompress=precompress,
+                search_index=search_index,
+                formats=formats,
+                stream=stream,
+                intern=intern,
+                patches=patches,
+                svg=svg,
+                overview=overview,
+            )
+        finally:
+            wb.close()
+    if (intern or patches) and layout != "single":
+        raise ValueError("Interning and patches are only supported for the single-file JSON report")
+    if stream:
+        if (
+            jobs > 1
+            or incremental
+            or intern
+            or patches
+            or svg
+            or layout != "single"
+            or search_index
+            or overview
+            or set(formats) != {"json"}
+        ):
+            raise ValueError("Streaming writes one JSON file serially, without --incremental or other outputs")
+        payload = stream_report(workbook_path, output_path, workbook, chart_source, verify_sample)
+        remove_other_layouts(output_path, layout)
+        unpublish_patches(output_path)
+        if precompress:
+            with profile_span("precompress"):
+                write_precompressed(output_path)
+        return payload
+
+    cache_path = cache_path_for(output_path) if incremental else None
+    payload = build_report(workbook_path, workbook, jobs, cache_path, engine, chart_source, verify_sample)
+
+    formats = set(formats)
+    written = []
+    if svg:
+        with profile_span("svg"):
+            written.extend(write_chart_svgs(payload, output_path))
+    with profile_span("write", layout=layout):
+        if "json" in formats:
+            remove_other_layouts(output_path, layout)
+        if "json" in formats and layout == "sharded":
+            manifest = write_sharded_report(payload, output_path)
+            written += [manifest_path_for(output_path)] + [
+                output_path.parent / indicator["file"]
+                for section in manifest["sections"]
+                for indicator in section["indicators"]
+            ]
+        elif "json" in formats and layout == "packed":
+            written += write_packed_report(payload, output_path, value_dtype)
+        elif "json" in formats:
+            if patches:
+                previous = expand_report(json.loads(output_path.read_text(encoding="utf-8"))) if output_path.exists() else None
+                payload, patch_files = publish_patch(previous, payload, output_path, patches)
+                written += patch_files
+            else:
+                unpublish_patches(output_path)
+            text = json.dumps(payload, ensure_ascii=False, indent=2)
+            if intern:
+                interned, stats = intern_report(payload)
+                bytes_before = len(text.encode("utf-8"))
+                text = json.dumps(interned, ensure_ascii=False, indent=2)
+                print_dedup_report(stats, bytes_before, len(text.encode("utf-8")))
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(text, encoding="utf-8")
+            written.append(output_path)
+        if "sqlite" in formats:
+            write_sqlite_report(payload, output_path.with_suffix(".sqlite"))
+        if "csv" in formats:
+            write_csv_report(payload, output_path)
+        if "parquet" in formats:
+            write_parquet_report(payload, output_path)
+        if search_index:
+            index_path = search_index_path_for(output_path)
+            write_text_atomic(index_path, json.dumps(build_search_index(payload), ensure_ascii=False, separators=(",", ":")))
+            written.append(index_path)
+        if overview:
+            overview_path = overview_path_for(output_path)
+            write_text_atomic(overview_path, json.dumps(build_overview(payload), ensure_ascii=False, separators=(",", ":")))
+            written.append(overview_path)
+
+    if precompress:
+        if brotli is None:
+            print("WARNING: brotli is not installed; writing .gz files only")
+        with profile_span("precompress"):
+            for path in written:
+                write_precompressed(path)
+    return payload
+
+
+def select_sheets(sheet_names: List[str], sheets: Iterable[str] = (), sections: Iterable[str] = ()) -> List[str]:
+    """Resolve --sheets and --sections filters to indicator sheet names, in workbook order.
+
+    Sheets match by name or slug, sections by section sheet name or slug; a
+    section selects the indicator sheets that follow it up to the next section.
+    Raises ValueError for names that match nothing."""
+    wanted_sheets = {value.strip() for value in sheets}
+    wanted_sections = {value.strip() for value in sections}
+    matched = set()
+    selected = []
+    current_section = None
+    for name in sheet_names:
+        keys = {name, slugify(name)}
+        if is_section_name(name):
+            current_section = name
+            matched.update(keys & wanted_sections)
+            continue
+        in_section = current_section is not None and {current_section, slugify(current_section)} & wanted_sections
+        if keys & wanted_sheets or in_section:
+            matched.update(keys & wanted_sheets)
+            selected.append(name)
+    unknown = (wanted_sheets | wanted_sections) - matched
+    if unknown:
+        raise ValueError(f"No sheet or section matches: {', '.join(sorted(unknown))}")
+    return selected
+
+
+def patch_report(existing: Dict, partial: Dict, sheet_order: List[str]) -> Dict:
+    """Replace or add the indicators of a partial report in an existing report.
+
+    Indicators are matched by sheet; indicators and sections are then kept in
+    workbook order (``sheet_order``), with sheets no longer in the workbook left
+    where they were."""
+    replaced = {indicator["sheet"] for section in partial["sections"] for indicator in section["indicators"]}
+    sections = []
+    for section in existing["sections"]:
+        indicators = [indicator for indicator in section["indicators"] if indicator["sheet"] not in replaced]
+        sections.append(dict(section, indicators=indicators))
+    by_slug = {section["slug"]: section for section in sections}
+    for section in partial["sections"]:
+        if section["slug"] in by_slug:
+            by_slug[section["slug"]]["indicators"].extend(section["indicators"])
+        else:
+            by_slug[section["slug"]] = dict(section)
+            sections.append(by_slug[section["slug"]])
+
+    position = {name: idx for idx, name in enumerate(sheet_order)}
+
+    def order(indicators: List[Dict]) -> List[Dict]:
+        # Unknown sheets keep the position of the indicator before them
+        keyed, last = [], -1
+        for indicator in indicators:
+            last = position.get(indicator["sheet"], last)
+            keyed.append((last, indicator))
+        return [indicator for _, indicator in sorted(keyed, key=lambda item: item[0])]
+
+    for section in sections:
+        section["indicators"] = order(section["indicators"])
+    sections = [section for section in sections if section["indicators"]]
+    sections.sort(key=lambda section: min(position.get(indicator["sheet"], len(position)) for indicator in section["indicators"]))
+    return dict(
+        existing,
+        generated_at=partial["generated_at"],
+        source_workbook=partial["source_workbook"],
+        section_count=len(sections),
+        sections=sections,
+    )
+
+
+def export_selection(
+    workbook_path: Path,
+    output_path: Path,
+    workbook,
+    sheets: List[str],
+    jobs: int = 1,
+    engine: str = "openpyxl",
+    chart_source: str = "cells",
+    verify_sample: int = 3,
+    intern: bool = False,
+    patches: int = 0,
+    svg: bool = False,
+) -> Dict:
+    """Export only ``sheets`` and patch them into the report at ``output_path``.
+
+    Only the selected sheets and the charts drawn on them are read, plus any
+    chart the existing report already lists for those sheets (a chart may sit
+    on another sheet than its data). Without an existing report, the partial
+    report is written as is. An interned existing report is expanded first; the
+    result is interned again with ``intern``. With ``patches`` > 0 the patch
+    from the existing report is published, and with ``svg`` the static SVGs
+    are brought up to date, as by ``export``."""
+    existing = expand_report(json.loads(output_path.read_text(encoding="utf-8"))) if output_path.exists() else None
+    with workbook_archive(workbook_path, workbook) as archive:
+        drawn = sheet_chart_parts(archive)
+        parts = set(archive.namelist())
+    chart_files = {part for name in sheets for part in drawn.get(name, ())}
+    if existing:
+        chart_files.update(
+            chart["source"]
+            for section in existing["sections"]
+            for indicator in section["indicators"]
+            if indicator["sheet"] in sheets
+            for chart in indicator["charts"]
+            if chart.get("source") in parts
+        )
+    partial = build_report(
+        workbook_path,
+        workbook,
+        jobs,
+        None,
+        engine,
+        chart_source,
+        verify_sample,
+        sheets=sheets,
+        chart_files=sorted(chart_files),
+    )
+    payload = patch_report(existing, partial, workbook.sheetnames) if existing else partial
+    if svg:
+        write_chart_svgs(payload, output_path)
+    if patches:
+        payload, _ = publish_patch(existing, payload, output_path, patches)
+    else:
+        payload.pop("version", None)
+        unpublish_patches(output_path)
+    write_text_atomic(output_path, json.dumps(intern_report(payload)[0] if intern else payload, ensure_ascii=False, indent=2))
+    remove_other_layouts(output_path, "single")
+    return payload
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """Serves the latest export of ``serve`` with ETag revalidation."""
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path != "/" and not path.endswith("/" + self.server.report_name):
+            self.send_error(404)
+            return
+        body, etag = self.server.report
+        if body is None:
+            self.send_error(503, "No export available yet")
+            return
+        if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(304)
+            self.send_report_headers(etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_report_headers(etag)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_report_headers(self, etag: str) -> None:
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Expose-Headers", "ETag")
+
+    def log_message(self, format, *args):
+        # Every poll of the frontend would otherwise be logged
+        pass
+
+
+def serve(
+    workbook_path: Path,
+    output_path: Path,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    poll_interval: float = 0.25,
+    jobs: int = 1,
+    engine: str = "openpyxl",
+    chart_source: str = "cells",
+    verify_sample: int = 3,
+    intern: bool = False,
+    svg: bool = False,
+) -> None:
+    """Export, then keep re-exporting whenever the workbook is saved, and serve the JSON over HTTP.
+
+    The workbook's mtime and size are polled every ``poll_interval`` seconds; a
+    change is exported once they have held still for one more interval, reusing
+    unchanged sheets and charts from an in-memory incremental cache; the
+    workbook itself is reopened (read-only) on every save. A failed export is
+    reported and the previous report kept, and watching goes on. Each export
+    is also written to ``output_path``. The report is served at ``/`` and at any
+    path ending in its file name, with an ETag over its content (excluding
+    ``generated_at``) so unchanged exports answer If-None-Match with 304. With
+    ``intern``, the written and served report goes through ``intern_report``,
+    and with ``svg`` its charts get static SVGs next to ``output_path``."""
+    memory_cache = {}
+    server = ThreadingHTTPServer((host, port), ReportRequestHandler)
+    server.report_name = output_path.name
+    server.report = (None, None)
+
+    def refresh() -> None:
+        start = time.perf_counter()
+        workbook = load_report_workbook(workbook_path, engine)
+        try:
+            payload = build_report(
+                workbook_path, workbook, jobs, None, engine, chart_source, verify_sample, memory_cache=memory_cache
+            )
+        finally:
+            workbook.close()
+        if svg:
+            write_chart_svgs(payload, output_path)
+        content = json.dumps({key: value for key, value in payload.items() if key != "generated_at"}, ensure_ascii=False)
+        etag = f'"{hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]}"'
+        if etag == server.report[1]:
+            print(f"Workbook saved, report unchanged ({time.perf_counter() - start:.2f}s)")
+            return
+        text = json.dumps(intern_report(payload)[0] if intern else payload, ensure_ascii=False, indent=2)
+        write_text_atomic(output_path, text)
+        remove_other_layouts(output_path, "single")
+        unpublish_patches(output_path)
+        server.report = (text.encode("utf-8"), etag)
+        print(f"Exported {output_path} in {time.perf_counter() - start:.2f}s")
+
+    def signature() -> Optional[Tuple[int, int]]:
+        try:
+            stat = workbook_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def watch() -> None:
+        seen = signature()
+        while True:
+            time.sleep(poll_interval)
+            current = signature()
+            if current is None or current == seen:
+                continue
+            # Wait for the save to finish before reading the file
+            time.sleep(poll_interval)
+            if signature() != current:
+                continue
+            seen = current
+            # Anything a half-written or odd workbook raises (XML ParseError, openpyxl's
+            # InvalidFileException, TypeError...) must not end the watcher
+            try:
+                refresh()
+            except Exception as exc:
+                traceback.print_exc()
+                print(f"WARNING: Export failed, still serving the previous report: {exc!r}")
+
+    refresh()
+    threading.Thread(target=watch, daemon=True).start()
+    print(f"Serving {output_path.name} on http://{host}:{port}/ and watching {workbook_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def edition_id(workbook_path: Path) -> str:
+    """Edition label for a workbook: the last year in its name ("... 1986-2024" -> "2024"), else its stem."""
+    years = re.findall(r"(?<!\d)(\d{4})(?!\d)", workbook_path.stem)
+    return years[-1] if years else workbook_path.stem
+
+
+def _same(a, b) -> bool:
+    # Equal and serialized identically, so 1 and 1.0 count as a change
+    if isinstance(a, (list, dict)) or isinstance(b, (list, dict)):
+        return json.dumps(a, ensure_ascii=False) == json.dumps(b, ensure_ascii=False)
+    return type(a) is type(b) and a == b
+
+
+def point_keys(categories: Optional[List], length: int) -> List[str]:
+    """Keys that line up a series' points across editions: the category when the
+    categories are unique and complete, else the position ("#3")."""
+    if (
+        isinstance(categories, list)
+        and len(categories) == length
+        and None not in categories
+        and len({str(category) for category in categories}) == length
+    ):
+        return [str(category) for category in categories]
+    return [f"#{idx}" for idx in range(length)]
+
+
+def _changed_fields(state: Dict, fields: Dict) -> Dict:
+    return {key: value for key, value in fields.items() if key not in state or not _same(state[key], value)}
+
+
+def merge_editions(reports: List[Tuple[str, Dict]]) -> Dict:
+    """Merge report payloads of several editions, oldest first, into one store.
+
+    Indicators are keyed by slug. For each edition the store records only what
+    is new or changed since the previous one: metadata fields, tables, chart
+    fields (including series names), category vectors and individual series
+    points. Each edition also lists its sections and indicator keys in order, so
+    ``edition_report`` can rebuild any edition exactly."""
+    store = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "editions": [],
+        "indicators": {},
+    }
+    states = {}
+    for edition, payload in reports:
+        edition_sections = []
+        seen = set()
+        for section in payload["sections"]:
+            keys = []
+            for indicator in section["indicators"]:
+                key, suffix = indicator["slug"], 2
+                while key in seen:
+                    key, suffix = f"{indicator['slug']}~{suffix}", suffix + 1
+                seen.add(key)
+                keys.append(key)
+                entry = store["indicators"].setdefault(key, {"meta": {}, "table": {}, "chart_count": {}, "charts": []})
+                state = states.setdefault(key, {"meta": {}, "table": (), "chart_count": None, "charts": []})
+
+                meta = {field: value for field, value in indicator.items() if field not in ("charts", "table")}
+                changed = _changed_fields(state["meta"], meta)
+                if changed:
+                    entry["meta"][edition] = changed
+                    state["meta"].update(changed)
+                if state["table"] == () or not _same(state["table"], indicator["table"]):
+                    entry["table"][edition] = state["table"] = indicator["table"]
+                if state["chart_count"] != len(indicator["charts"]):
+                    entry["chart_count"][edition] = state["chart_count"] = len(indicator["charts"])
+
+                for chart_idx, chart in enumerate(indicator["charts"]):
+                    if chart_idx == len(entry["charts"]):
+                        entry["charts"].append({"meta": {}, "categories": {}, "points": {}})
+                        state["charts"].append({"meta": {}, "categories": (), "points": {}})
+                    chart_entry, chart_state = entry["charts"][chart_idx], state["charts"][chart_idx]
+                    chart_meta = {field: value for field, value in chart.items() if field not in ("categories", "series")}
+                    chart_meta["series"] = [
+                        dict({field: value for field, value in serie.items() if field != "values"}, length=len(serie["values"]))
+                        for serie in chart["series"]
+                    ]
+                    changed = _changed_fields(chart_state["meta"], chart_meta)
+                    if changed:
+                        chart_entry["meta"][edition] = changed
+                        chart_state["meta"].update(changed)
+                    categories = chart["categories"]
+                    if chart_state["categories"] == () or not _same(chart_state["categories"], categories):
+                        chart_entry["categories"][edition] = chart_state["categories"] = categories
+                    for series_idx, serie in enumerate(chart["series"]):
+                        points = chart_state["points"].setdefault(str(series_idx), {})
+                        keyed = zip(point_keys(categories, len(serie["values"])), serie["values"])
+                        changes = {key: value for key, value in keyed if key not in points or not _same(points[key], value)}
+                        if changes:
+                            chart_entry["points"].setdefault(str(series_idx), {})[edition] = changes
+                            points.update(changes)
+            edition_sections.append({"title": section["title"], "slug": section["slug"], "indicators": keys})
+        store["editions"].append(
+            {
+                "id": edition,
+                "source_workbook": payload["source_workbook"],
+                "generated_at": payload["generated_at"],
+                "sections": edition_sections,
+            }
+        )
+    return store
+
+
+def edition_report(store: Dict, edition: str) -> Dict:
+    """Rebuild the report payload of one edition from a ``merge_editions`` store."""
+    order = [entry["id"] for entry in store["editions"]]
+    editions = order[: order.index(edition) + 1]
+    target = store["editions"][len(editions) - 1]
+
+    def as_of(changes: Dict, default=None):
+        value = default
+        for past in editions:
+            if past in changes:
+                value = changes[past]
+        return value
+
+    def merged(changes: Dict) -> Dict:
+        fields = {}
+        for past in editions:
+            fields.update(changes.get(past, {}))
+        return fields
+
+    sections = []
+    for section in target["sections"]:
+        indicators = []
+        for key in section["indicators"]:
+            entry = store["indicators"][key]
+            indicator = merged(entry["meta"])
+            charts = []
+            for chart_entry in entry["charts"][: as_of(entry["chart_count"], 0)]:
+                chart_meta = merged(chart_entry["meta"])
+                categories = as_of(chart_entry["categories"])
+                series = []
+                for series_idx, serie in enumerate(chart_meta["series"]):
+                    points = merged(chart_entry["points"].get(str(series_idx), {}))
+                    keys = point_keys(categories, serie["length"])
+                    rebuilt_serie = {"name": serie["name"], "values": [points.get(point) for point in keys]}
+                    rebuilt_serie.update((field, value) for field, value in serie.items() if field not in ("name", "length"))
+                    series.append(rebuilt_serie)
+                chart = {}
+                for field, value in chart_meta.items():
+                    if field == "series":
+                        continue
+                    chart[field] = value
+                    if field == "type":
+                        chart["categories"] = categories
+                        chart["series"] = series
+                charts.append(chart)
+            rebuilt = {}
+            for field, value in indicator.items():
+                rebuilt[field] = value
+                if field == "sheet":
+                    rebuilt["charts"] = charts
+                    rebuilt["table"] = as_of(entry["table"])
+            indicators.append(rebuilt)
+        sections.append({"title": section["title"], "slug": section["slug"], "indicators": indicators})
+    return {
+        "generated_at": target["generated_at"],
+        "source_workbook": target["source_workbook"],
+        "section_count": len(sections),
+        "sections": sections,
+    }
+
+
+def _build_report_task(workbook_path: Path, engine: str, chart_source: str, verify_sample: int) -> Dict:
+    workbook = load_report_workbook(workbook_path, engine)
+    try:
+        return build_report(workbook_path, workbook, engine=engine, chart_source=chart_source, verify_sample=verify_sample)
+    finally:
+        workbook.close()
+
+
+def export_batch(
+    workbook_paths: List[Path],
+    store_path: Path,
+    jobs: int = 1,
+    engine: str = "openpyxl",
+    chart_source: str = "cells",
+    verify_sample: int = 3,
+) -> Dict:
+    """Export several yearly editions, ``jobs`` workbooks at a time, into one merged store.
+
+    Editions are ordered by ``edition_id`` and merged with ``merge_editions``."""
+    workbook_paths = sorted(workbook_paths, key=lambda path: (edition_id(path), path.name))
+    options = ([engine] * len(workbook_paths), [chart_source] * len(workbook_paths), [verify_sample] * len(workbook_paths))
+    if jobs > 1 and len(workbook_paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(workbook_paths))) as pool:
+            payloads = list(pool.map(_build_report_task, workbook_paths, *options))
+    else:
+        payloads = list(map(_build_report_task, workbook_paths, *options))
+
+    ids = [edition_id(path) for path in workbook_paths]
+    if len(set(ids)) != len(ids):
+        ids = [path.stem for path in workbook_paths]
+    store = merge_editions(list(zip(ids, payloads)))
+    write_text_atomic(store_path, json.dumps(store, ensure_ascii=False, separators=(",", ":")))
+    return store
+
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace, jobs: int, patches: int, workbook_paths: List[Path]):
+    """Carry out the export mode chosen on the command line (after main() has checked the options)."""
+    if workbook_paths:
+        store = export_batch(workbook_paths, args.store, jobs, args.engine, args.chart_source, args.verify_sample)
+        editions = ", ".join(edition["id"] for edition in store["editions"])
+        print(f"Wrote {args.store} with {len(store['indicators'])} indicators across editions {editions}.")
+        return
+
+    if args.serve:
+        serve(
+            args.workbook,
+            args.output,
+            args.host,
+            args.port,
+            args.poll_interval,
+            jobs,
+            args.engine,
+            args.chart_source,
+            args.verify_sample,
+            args.intern,
+            args.svg,
+        )
+        return
+
+    with profile_span("load"):
+        wb = load_report_workbook(args.workbook, args.engine)
+    if args.sheets or args.sections:
+        try:
+            selected = select_sheets(wb.sheetnames, args.sheets, args.sections)
+        except ValueError as exc:
+            wb.close()
+            parser.error(str(exc))
+        try:
+            payload = export_selection(
+                args.workbook,
+                args.output,
+                wb,
+                selected,
+                jobs,
+                args.engine,
+                args.chart_source,
+                args.verify_sample,
+                args.intern,
+                patches,
+                args.svg,
+            )
+        finally:
+            wb.close()
+        total_indicators = sum(len(section["indicators"]) for section in payload["sections"])
+        print(f"Updated {len(selected)} sheet(s) in {args.output} ({total_indicators} indicators): {', '.join(selected)}")
+        return
+    try:
+        payload = export(
+            args.workbook,
+            args.output,
+            wb,
+            jobs=jobs,
+            incremental=args.incremental,
+            engine=args.engine,
+            chart_source=args.chart_source,
+            verify_sample=args.verify_sample,
+            layout=args.layout,
+            value_dtype=args.value_dtype,
+            precompress=args.precompress,
+            search_index=args.search_index,
+            formats=args.format,
+            stream=args.stream,
+            intern=args.intern,
+            patches=patches,
+            svg=args.svg,
+            overview=args.overview,
+        )
+        all_excel_sheets = set(wb.sheetnames)
+    finally:
+        wb.close()
+    
+    # Debug: list all indicators
+    total_indicators = sum(len(section["indicators"]) for section in payload["sections"])
+    if "json" not in args.format:
+        written_path = args.output.with_suffix(".sqlite") if "sqlite" in args.format else args.output.with_name(
+            f"{args.output.stem}.points.{args.format[0]}"
+        )
+    elif args.layout == "sharded":
+        written_path = manifest_path_for(args.output)
+    elif args.layout == "packed":
+        written_path = packed_path_for(args.output)
+    else:
+        written_path = args.output
+    print(f"Wrote {written_path} with {payload['section_count']} sections and {total_indicators} indicators.")
+    
+    # List all sheet names processed
+    all_sheets = []
+    for section in payload["sections"]:
+        for indicator in section["indicators"]:
+            all_sheets.append(indicator["sheet"])
+    
+    # Check for missing sheets
+    processed_sheets_set = set(all_sheets)
+    missing = all_excel_sheets - processed_sheets_set
     if missing:
         missing_list = ', '.join(sorted(missing))
         print(f"WARNING: Missing sheets ({len(missing)}): {missing_list}")
@@ -602,6 +3345,248 @@ def main():
     print(f"Last 10 processed: {', '.join(all_sheets[-10:])}")
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Export Svenska Trender charts to JSON.")
+    parser.add_argument(
+        "--workbook",
+        type=Path,
+        default=Path("3. Svenska trender 1986-2024.xlsm"),
+        help="Path to the macro-enabled Excel workbook.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("data/report-data.json"),
+        help="Destination JSON path.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for chart parsing and sheet extraction (0 = one per CPU).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse sheets and charts from the last incremental run whose workbook parts are unchanged.",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("openpyxl", "fast"),
+        default="openpyxl",
+        help="Cell reader: openpyxl, or 'fast' to read the sheet XML directly (falls back to openpyxl).",
+    )
+    parser.add_argument(
+        "--chart-source",
+        choices=("cells", "cache"),
+        default="cells",
+        help="Read chart values from the workbook cells, or from the caches stored in the chart parts.",
+    )
+    parser.add_argument(
+        "--verify-sample",
+        type=int,
+        default=3,
+        help="With --chart-source cache, number of charts to check against the cells (0 = none).",
+    )
+    parser.add_argument(
+        "--layout",
+        choices=("single", "sharded", "packed"),
+        default="single",
+        help=(
+            "Write one JSON file, a manifest plus one content-hashed file per indicator, "
+            "or minified JSON plus a packed binary file of series values."
+        ),
+    )
+    parser.add_argument(
+        "--value-dtype",
+        choices=("float64", "float32"),
+        default="float64",
+        help="Element type of the series values with --layout packed.",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="Also write .gz and .br (if brotli is installed) siblings of every output file.",
+    )
+    parser.add_argument(
+        "--format",
+        nargs="+",
+        choices=("json", "sqlite", "csv", "parquet"),
+        default=["json"],
+        help=(
+            "Outputs to write: the JSON report, and/or long-format indicator/chart/point tables "
+            "as <output stem>.sqlite, .<table>.csv or .<table>.parquet files (parquet needs pyarrow)."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Write the report one indicator at a time, keeping memory use to about one indicator.",
+    )
+    parser.add_argument(
+        "--intern",
+        action="store_true",
+        help=(
+            "Store shared category vectors and repeated texts once, in a top-level 'interned' table "
+            "referenced by index, and print how many bytes that saved (--layout single only)."
+        ),
+    )
+    parser.add_argument(
+        "--patches",
+        action="store_true",
+        help=(
+            "Version the report and publish the changes since the previous one as <output stem>.v<N>.patch.json, "
+            "listed in <output stem>.patches.json (--layout single only)."
+        ),
+    )
+    parser.add_argument(
+        "--keep-patches",
+        type=int,
+        default=5,
+        help="Number of patches kept in the chain with --patches.",
+    )
+    parser.add_argument(
+        "--svg",
+        action="store_true",
+        help=(
+            "Also draw a static SVG of every line, bar and area chart into <output stem>-charts/, "
+            "referenced from the charts as 'svg'; SVGs of unchanged charts are reused."
+        ),
+    )
+    parser.add_argument(
+        "--search-index",
+        action="store_true",
+        help="Also write a prefix-searchable inverted index of the indicators (<output>.search.json).",
+    )
+    parser.add_argument(
+        "--overview",
+        action="store_true",
+        help=(
+            "Also write a summary (latest value, change, min/max, trend) and a downsampled sparkline "
+            "of every series (<output stem>.overview.json)."
+        ),
+    )
+    parser.add_argument(
+        "--workbooks",
+        nargs="+",
+        metavar="PATTERN",
+        help="Batch mode: workbook paths or glob patterns, one per edition, merged into --store.",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=Path("data/report-store.json"),
+        help="Destination of the merged multi-edition store in batch mode.",
+    )
+    parser.add_argument(
+        "--sheets",
+        nargs="+",
+        default=[],
+        metavar="SHEET",
+        help="Export only these indicator sheets (names or slugs) and patch them into the existing --output.",
+    )
+    parser.add_argument(
+        "--sections",
+        nargs="+",
+        default=[],
+        metavar="SECTION",
+        help="Export only the indicator sheets of these sections (names or slugs), patching --output.",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Keep running: re-export when the workbook is saved and serve the JSON over HTTP.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to serve on with --serve.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to serve on with --serve.")
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.25,
+        help="Seconds between checks of the workbook's modification time with --serve.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time and tracemalloc peak per stage and the slowest sheets.",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="Number of sheets in the --profile slowest-sheets table.",
+    )
+    parser.add_argument(
+        "--trace-out",
+        type=Path,
+        help="Write a Chrome trace-event JSON of the export stages, sheets and charts to this path.",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    diff_parser = subparsers.add_parser(
+        "diff", help="Print the indicators, charts and series that differ between two exported reports."
+    )
+    diff_parser.add_argument("old", type=Path, help="Earlier report JSON.")
+    diff_parser.add_argument("new", type=Path, nargs="?", help="Later report JSON (default: --output).")
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    patches = args.keep_patches if args.patches else 0
+
+    if args.command == "diff":
+        old, new = (
+            expand_report(json.loads(path.read_text(encoding="utf-8"))) for path in (args.old, args.new or args.output)
+        )
+        print_report_diff(old, new)
+        return
+
+    workbook_paths = sorted({Path(match) for pattern in args.workbooks for match in glob.glob(pattern)}) if args.workbooks else []
+    if args.workbooks and not workbook_paths:
+        parser.error("--workbooks matched no files")
+    if args.serve and args.layout != "single":
+        parser.error("--serve only supports --layout single")
+    if args.serve and args.patches:
+        parser.error("--serve cannot be combined with --patches")
+    if args.stream and (
+        jobs > 1
+        or args.incremental
+        or args.intern
+        or args.patches
+        or args.svg
+        or args.layout != "single"
+        or args.search_index
+        or args.overview
+        or args.format != ["json"]
+    ):
+        parser.error(
+            "--stream cannot be combined with --jobs, --incremental, --intern, --patches, --svg, --layout, "
+            "--search-index, --overview or --format"
+        )
+    if (args.intern or args.patches) and args.layout != "single":
+        parser.error("--intern and --patches only support --layout single")
+    if "parquet" in args.format and pyarrow is None:
+        parser.error("--format parquet requires the pyarrow package")
+    if (args.sheets or args.sections) and (args.layout != "single" or args.incremental):
+        parser.error("--sheets/--sections only support --layout single without --incremental")
+
+    global _profiler
+    if args.profile or args.trace_out:
+        _profiler = Profiler()
+        if jobs > 1:
+            print("WARNING: Sheets and charts handled by --jobs workers are not profiled individually")
+
+    try:
+        run(parser, args, jobs, patches, workbook_paths)
+    finally:
+        # Every mode ends here, so --profile and --trace-out also cover --workbooks, --serve and --sheets
+        if _profiler is not None:
+            _profiler.close()
+            if args.profile:
+                print()
+                _profiler.print_summary(args.profile_top)
+            if args.trace_out:
+                write_text_atomic(args.trace_out, json.dumps(_profiler.trace_events()))
+                print(f"Wrote trace to {args.trace_out}")
+
+
 if __name__ == "__main__":
     main()
 
@@ -1,29 +1,47 @@
-import { useEffect, useState, useRef } from 'react'
-import {
-  CartesianGrid,
-  Line,
-  LineChart,
-  ResponsiveContainer,
-  Tooltip,
-  XAxis,
-  YAxis,
-  LabelList,
-} from 'recharts'
-import type { NameType, ValueType } from 'recharts/types/component/DefaultTooltipContent'
+import { lazy, Suspense, useEffect, useState, useRef } from 'react'
 import './App.css'
 
+// recharts is only needed once a chart is drawn; until then the static SVG from --svg is shown
+const InteractiveChart = lazy(() => import('./InteractiveChart'))
+
+type SeriesSummary = {
+  count: number
+  latest: number
+  latest_category: number | string | null
+  change: number | null
+  previous_category: number | string | null
+  min: number
+  max: number
+  trend: number | null
+}
+
 type ChartSeries = {
   name: string
   values: (number | null)[]
+  type?: string // series of a combo chart drawn as another type than the chart
 }
 
-type ChartDefinition = {
+// Exports with --overview write report-data.overview.json: per sheet, per chart, per series
+type SeriesOverview = {
+  name: string
+  summary: SeriesSummary | null
+  sparkline: [number, number][] | null // [index into values, value], at most 24 points
+}
+
+type ReportOverview = {
+  version: number
+  generated_at: string
+  indicators: Record<string, SeriesOverview[][]>
+}
+
+export type ChartDefinition = {
   id: string
   title?: string
   sheet: string
   type: string
   categories: (number | string | null)[]
   series: ChartSeries[]
+  svg?: string // static SVG from --svg, relative to the data directory
 }
 
 type Indicator = {
@@ -31,13 +49,15 @@ type Indicator = {
   slug: string
   sheet: string
   charts: ChartDefinition[]
-  table?: (string | null)[][] | null
+  table?: (string | number | null)[][] | null
   typ?: string | null
   fraga?: string | null
   kommentar?: string | null
   underrubrik?: string | null
   rubrik?: string | null
   kalla?: string | null
+  file?: string // sharded layout: the indicator's own file, until it has been fetched
+  chart_svgs?: (string | null)[] // sharded layout with --svg: each chart's static SVG
 }
 
 type Section = {
@@ -50,10 +70,331 @@ type ReportData = {
   generated_at: string
   source_workbook: string
   section_count: number
+  version?: number // set by exports with --patches
   sections: Section[]
 }
 
-const palette = ['#111827', '#A44E07', '#2563EB', '#059669', '#9333EA', '#DC2626']
+// With --layout sharded, report-data.manifest.json lists the indicators and each one's
+// charts and table sit in a content-hashed file of its own, fetched when it is opened
+type ManifestIndicator = Omit<Indicator, 'charts' | 'table'> & {
+  chart_types: string[]
+  file: string
+}
+
+type ReportManifest = Omit<ReportData, 'sections'> & {
+  sections: (Omit<Section, 'indicators'> & { indicators: ManifestIndicator[] })[]
+}
+
+// With --layout packed, report-data.packed.json holds the report without the series values;
+// those are one little-endian float64/float32 array in values_file, and each flat series
+// gives its [offset, length] in values_slice instead (NaN marks a missing value)
+type PackedReport = ReportData & {
+  values_dtype: 'float64' | 'float32'
+  values_file: string
+}
+
+type PackedSeries = ChartSeries & { values_slice?: [number, number] }
+
+// Exports made with --intern store shared category vectors and repeated texts once;
+// charts and indicators then hold an index into these lists instead
+type InternedValues = {
+  categories: (number | string | null)[][]
+  strings: string[]
+}
+
+const INTERNED_INDICATOR_FIELDS = ['typ', 'rubrik', 'underrubrik', 'fraga', 'kommentar', 'kalla'] as const
+
+// Resolve interned references, so all charts share one categories array and one copy of each text
+const expandReport = (payload: ReportData & { interned?: InternedValues }): ReportData => {
+  const { interned, ...report } = payload
+  if (!interned) return payload
+  const text = <T,>(value: T): T | string => (typeof value === 'number' ? interned.strings[value] : value)
+  return {
+    ...report,
+    sections: report.sections.map((section) => ({
+      ...section,
+      indicators: section.indicators.map((indicator) => {
+        const expanded: Indicator = {
+          ...indicator,
+          charts: indicator.charts.map((chart) => ({
+            ...chart,
+            categories: typeof chart.categories === 'number' ? interned.categories[chart.categories] : chart.categories,
+            series: chart.series.map((serie) => ({ ...serie, name: text(serie.name) })),
+          })),
+        }
+        INTERNED_INDICATOR_FIELDS.forEach((field) => {
+          expanded[field] = text(indicator[field])
+        })
+        return expanded
+      }),
+    })),
+  }
+}
+
+// Exports with --patches publish report-data.patches.json and one patch per version;
+// the formats mirror diff_reports in scripts/export_report_data.py
+type PatchManifest = {
+  version: number | null
+  patches: { from: number; to: number; file: string; bytes: number }[]
+}
+
+type Item = Record<string, unknown>
+type FieldsDiff = { set?: Item; drop?: string[] }
+type ItemsDiff = { replace?: Item[]; changes?: (FieldsDiff & ItemsDiff & { index: number })[] }
+
+type ReportPatch = {
+  from_version: number
+  to_version: number
+  generated_at: string
+  source_workbook: string
+  sections: [string, string, string[]][] // [slug, title, indicator keys]
+  added: Record<string, Indicator>
+  removed: string[]
+  changed: Record<string, FieldsDiff & { charts?: ItemsDiff }>
+}
+
+const REPORT_STORAGE_KEY = 'svenskatrender:report-data'
+
+const applyFields = (item: Item, diff: FieldsDiff): Item => {
+  const patched: Item = { ...item }
+  diff.drop?.forEach((key) => delete patched[key])
+  return Object.assign(patched, diff.set)
+}
+
+// Charts carry their series changes in the same change entry
+const applyItems = (items: Item[], diff: ItemsDiff, nested = false): Item[] => {
+  if (diff.replace) return diff.replace
+  const patched = [...items]
+  diff.changes?.forEach((change) => {
+    const item = applyFields(patched[change.index], change)
+    if (nested) item.series = applyItems(item.series as Item[], change)
+    patched[change.index] = item
+  })
+  return patched
+}
+
+// Indicators keyed as by the exporter: by slug, with "~2", "~3"... for repeated slugs
+const keyedIndicators = (report: ReportData): Map<string, Indicator> => {
+  const indicators = new Map<string, Indicator>()
+  report.sections.forEach((section) =>
+    section.indicators.forEach((indicator) => {
+      let key = indicator.slug
+      for (let suffix = 2; indicators.has(key); suffix++) key = `${indicator.slug}~${suffix}`
+      indicators.set(key, indicator)
+    }),
+  )
+  return indicators
+}
+
+const applyPatch = (report: ReportData, patch: ReportPatch): ReportData => {
+  const indicators = keyedIndicators(report)
+  Object.entries(patch.changed).forEach(([key, diff]) => {
+    const indicator = applyFields(indicators.get(key) as unknown as Item, diff)
+    if (diff.charts) indicator.charts = applyItems(indicator.charts as Item[], diff.charts, true)
+    indicators.set(key, indicator as unknown as Indicator)
+  })
+  Object.entries(patch.added).forEach(([key, indicator]) => indicators.set(key, indicator))
+  const sections = patch.sections.map(([slug, title, keys]) => ({
+    title,
+    slug,
+    indicators: keys.map((key) => indicators.get(key) as Indicator),
+  }))
+  return {
+    ...report,
+    generated_at: patch.generated_at,
+    source_workbook: patch.source_workbook,
+    section_count: sections.length,
+    version: patch.to_version,
+    sections,
+  }
+}
+
+const fetchJson = async <T,>(url: string, init?: RequestInit): Promise<T> => {
+  const res = await fetch(url, init)
+  if (!res.ok) {
+    throw new Error(`Kunde inte läsa ${url} (${res.status} ${res.statusText})`)
+  }
+  return res.json()
+}
+
+const saveReport = (report: ReportData) => {
+  try {
+    if (report.version == null) {
+      localStorage.removeItem(REPORT_STORAGE_KEY)
+    } else {
+      localStorage.setItem(REPORT_STORAGE_KEY, JSON.stringify(report))
+    }
+  } catch {
+    // Storage full or disabled: the next visit downloads the full report again
+  }
+}
+
+// Bring the report saved by an earlier visit up to date through the patch chain;
+// null when nothing is saved or the chain does not start at the saved version
+const updateSavedReport = async (dataUrl: string): Promise<ReportData | null> => {
+  let report: ReportData | null = null
+  try {
+    report = JSON.parse(localStorage.getItem(REPORT_STORAGE_KEY) ?? 'null')
+  } catch {
+    return null
+  }
+  if (report?.version == null) return null
+  const manifestUrl = dataUrl.replace(/\.json$/, '.patches.json')
+  const manifest = await fetchJson<PatchManifest>(manifestUrl, { cache: 'no-cache' })
+  if (manifest.version == null) return null
+  if (report.version === manifest.version) return report
+  const start = manifest.patches.findIndex((entry) => entry.from === report?.version)
+  if (start === -1) return null
+  const baseUrl = manifestUrl.slice(0, manifestUrl.lastIndexOf('/') + 1)
+  for (const entry of manifest.patches.slice(start)) {
+    // Patch files never change, so the browser cache may keep them
+    report = applyPatch(report, await fetchJson<ReportPatch>(baseUrl + entry.file))
+  }
+  saveReport(report)
+  return report
+}
+
+// The manifest stands in for the report; its indicators have no charts until their file is loaded
+const loadManifest = async (dataUrl: string): Promise<ReportData | null> => {
+  const manifestUrl = dataUrl.replace(/\.json$/, '.manifest.json')
+  const manifest = await fetchJson<ReportManifest>(manifestUrl, { cache: 'no-cache' }).catch(() => null)
+  if (!manifest) return null
+  return {
+    ...manifest,
+    sections: manifest.sections.map((section) => ({
+      ...section,
+      indicators: section.indicators.map((indicator) => ({ ...indicator, charts: [] })),
+    })),
+  }
+}
+
+const unpackReport = (packed: PackedReport, buffer: ArrayBuffer): ReportData => {
+  // Typed arrays use the platform's byte order, which is little-endian in all browsers
+  const float32 = packed.values_dtype === 'float32'
+  const values = float32 ? new Float32Array(buffer) : new Float64Array(buffer)
+  // float32 cannot hold 84.7 exactly; seven significant digits give back the exported number
+  const decode = (value: number) => (Number.isNaN(value) ? null : float32 ? Number(value.toPrecision(7)) : value)
+  return {
+    ...packed,
+    sections: packed.sections.map((section) => ({
+      ...section,
+      indicators: section.indicators.map((indicator) => ({
+        ...indicator,
+        charts: indicator.charts.map((chart) => ({
+          ...chart,
+          series: chart.series.map((serie: PackedSeries) => {
+            if (!serie.values_slice) return serie
+            const [offset, length] = serie.values_slice
+            return { name: serie.name, type: serie.type, values: Array.from(values.subarray(offset, offset + length), decode) }
+          }),
+        })),
+      })),
+    })),
+  }
+}
+
+const loadPackedReport = async (dataUrl: string): Promise<ReportData | null> => {
+  const packedUrl = dataUrl.replace(/\.json$/, '.packed.json')
+  const packed = await fetchJson<PackedReport>(packedUrl, { cache: 'no-cache' }).catch(() => null)
+  if (!packed) return null
+  const valuesUrl = packedUrl.slice(0, packedUrl.lastIndexOf('/') + 1) + packed.values_file
+  const res = await fetch(valuesUrl, { cache: 'no-cache' })
+  if (!res.ok) {
+    throw new Error(`Kunde inte läsa ${valuesUrl} (${res.status} ${res.statusText})`)
+  }
+  return unpackReport(packed, await res.arrayBuffer())
+}
+
+const replaceIndicator = (report: ReportData, file: string, indicator: Indicator): ReportData => ({
+  ...report,
+  sections: report.sections.map((section) => ({
+    ...section,
+    indicators: section.indicators.map((current) => (current.file === file ? indicator : current)),
+  })),
+})
+
+const loadReport = async (dataUrl: string): Promise<ReportData> => {
+  const saved = await updateSavedReport(dataUrl).catch(() => null)
+  if (saved) return saved
+  // Always revalidate with the server (ETag), so unchanged data comes back as a cheap 304
+  const res = await fetch(dataUrl, { cache: 'no-cache' })
+  if (res.status === 404) {
+    // Sharded and packed exports remove the single report, so their files are only probed without it
+    const report = (await loadManifest(dataUrl)) ?? (await loadPackedReport(dataUrl))
+    if (report) return report
+  }
+  if (!res.ok) {
+    throw new Error(`Kunde inte läsa ${dataUrl} (${res.status} ${res.statusText})`)
+  }
+  const payload = expandReport((await res.json()) as ReportData & { interned?: InternedValues })
+  saveReport(payload)
+  return payload
+}
+
+// A small line of the indicator's first series for the sidebar, from the overview file
+const NavSparkline = ({ serie }: { serie?: SeriesOverview }) => {
+  const points = serie?.sparkline
+  if (!points || points.length < 2) return null
+  const first = points[0][0]
+  const span = points[points.length - 1][0] - first || 1
+  const values = points.map(([, value]) => value)
+  const low = Math.min(...values)
+  const range = Math.max(...values) - low || 1
+  const path = points
+    .map(([idx, value], i) => `${i ? 'L' : 'M'}${(((idx - first) / span) * 48).toFixed(1)} ${(15 - ((value - low) / range) * 14).toFixed(1)}`)
+    .join(' ')
+  return (
+    <svg className="nav-link__sparkline" viewBox="0 0 48 16" width="48" height="16" aria-hidden="true">
+      {serie?.summary && (
+        <title>{`Senast ${Math.round(serie.summary.latest)} (${serie.summary.latest_category ?? '–'})`}</title>
+      )}
+      <path d={path} fill="none" stroke="currentColor" strokeWidth="1.5" />
+    </svg>
+  )
+}
+
+// Exports with --search-index write report-data.search.json; see build_search_index in
+// scripts/export_report_data.py
+type SearchIndex = {
+  version: number
+  generated_at: string
+  fields: string[]
+  docs: [string, string, string][] // [section slug, indicator slug, title]
+  terms: string[] // sorted, so the terms starting with a prefix form one range
+  postings: [number, number][][] // per term: [doc, bit n set when the term occurs in fields[n]]
+}
+
+const SEARCH_STOPWORDS = new Set('av de den det du eller en ett for fran har i med och om pa till ar att vad hur'.split(' '))
+
+// Query words folded like the indexed terms ("Förtroende" -> "fortroende"), see search_tokens
+const searchTokens = (text: string): string[] =>
+  text
+    .trim()
+    .toLowerCase()
+    .normalize('NFKD')
+    .replace(/\p{M}/gu, '')
+    .split(/[^a-z0-9]+/)
+    .filter((token) => (token.length > 1 || /^[0-9]$/.test(token)) && !SEARCH_STOPWORDS.has(token))
+
+// Every word must start some term of the indicator; gives "section/indicator" slug keys
+const searchIndexHits = (index: SearchIndex, words: string[]): Set<string> => {
+  let hits: Set<number> | null = null
+  for (const word of words) {
+    let low = 0
+    let high = index.terms.length
+    while (low < high) {
+      const mid = (low + high) >> 1
+      if (index.terms[mid] < word) low = mid + 1
+      else high = mid
+    }
+    const docs = new Set<number>()
+    for (let term = low; term < index.terms.length && index.terms[term].startsWith(word); term++) {
+      index.postings[term].forEach(([doc]) => docs.add(doc))
+    }
+    hits = hits ? new Set([...hits].filter((doc) => docs.has(doc))) : docs
+  }
+  return new Set([...(hits ?? [])].map((doc) => `${index.docs[doc][0]}/${index.docs[doc][1]}`))
+}
 
 const formatChartData = (chart?: ChartDefinition) => {
   if (!chart) return []
@@ -119,28 +460,27 @@ const getYearRange = (indicator: Indicator): string | null => {
 
 function App() {
   const [report, setReport] = useState<ReportData | null>(null)
+  const [overview, setOverview] = useState<ReportOverview | null>(null)
   const [error, setError] = useState<string | null>(null)
   const [selectedSection, setSelectedSection] = useState<string | null>(null)
   const [selectedIndicator, setSelectedIndicator] = useState<string | null>(null)
   const [searchQuery, setSearchQuery] = useState('')
+  const [searchIndex, setSearchIndex] = useState<SearchIndex | null>(null)
+  const searchIndexRequested = useRef(false)
   const [isMobileMenuOpen, setIsMobileMenuOpen] = useState(false)
   const contentRef = useRef<HTMLElement>(null)
   const activeIndicatorRef = useRef<HTMLLIElement>(null)
+  // Static SVGs and indicator files are referenced relative to the directory of report-data.json
+  const dataDir = `${import.meta.env.BASE_URL || '/'}data/`.replace(/\/+/g, '/')
 
   useEffect(() => {
     // Use import.meta.env.BASE_URL to handle the base path correctly
     const baseUrl = import.meta.env.BASE_URL || '/'
-    // Add cache-busting query parameter to force reload of updated data
-    const dataUrl = `${baseUrl}data/report-data.json?v=${Date.now()}`.replace(/\/+/g, '/') // Remove duplicate slashes
+    const dataUrl = `${baseUrl}data/report-data.json`.replace(/\/+/g, '/') // Remove duplicate slashes
     
-    fetch(dataUrl)
-      .then(async (res) => {
-        if (!res.ok) {
-          throw new Error(`Kunde inte läsa report-data.json (${res.status} ${res.statusText})`)
-        }
-        return res.json()
-      })
-      .then((payload: ReportData) => {
+    // The sharded manifest, the packed report, a saved report patched up to date, or else the full report
+    loadReport(dataUrl)
+      .then((payload) => {
         setReport(payload)
         const firstSection = payload.sections[0]
         const firstIndicator = firstSection?.indicators[0]
@@ -152,6 +492,10 @@ function App() {
         console.error('Attempted URL:', dataUrl)
         setError('Kunde inte ladda rapportdatan. Kontrollera att exporten har körts.')
       })
+    // Optional: only exports with --overview write it
+    fetchJson<ReportOverview>(dataUrl.replace(/\.json$/, '.overview.json'), { cache: 'no-cache' })
+      .then(setOverview)
+      .catch(() => setOverview(null))
   }, [])
 
   const sections = report?.sections ?? []
@@ -170,6 +514,28 @@ function App() {
     }
   }, [activeIndicator, activeSection, selectedIndicator, selectedSection])
 
+  // Sharded layout: fetch an indicator's file the first time it is opened
+  const pendingFile = activeIndicator?.file
+  useEffect(() => {
+    if (!pendingFile) return
+    // Indicator files never change (their name holds a content hash), so the browser cache may keep them
+    fetchJson<Indicator>(`${dataDir}${pendingFile}`)
+      .then((indicator) => setReport((current) => current && replaceIndicator(current, pendingFile, indicator)))
+      .catch((err: Error) => {
+        console.error('Error loading indicator:', err)
+        setError('Kunde inte ladda indikatorn. Försök att ladda om sidan.')
+      })
+  }, [pendingFile, dataDir])
+
+  // The search index is fetched on the first search; without one, titles are matched as before
+  useEffect(() => {
+    if (!searchQuery.trim() || searchIndexRequested.current) return
+    searchIndexRequested.current = true
+    fetchJson<SearchIndex>(`${dataDir}report-data.search.json`, { cache: 'no-cache' })
+      .then(setSearchIndex)
+      .catch(() => setSearchIndex(null))
+  }, [searchQuery, dataDir])
+
   // Scroll to top when indicator changes
   useEffect(() => {
     if (contentRef.current && selectedIndicator) {
@@ -184,9 +550,18 @@ function App() {
     }
   }, [selectedIndicator])
 
-  // Filter indicators by search
+  // Filter indicators by search: through the index when it belongs to this report (it also
+  // covers question, comment and source texts), else by title
+  const queryWords = searchTokens(searchQuery)
+  const indexHits =
+    searchIndex && searchIndex.generated_at === report?.generated_at && queryWords.length > 0
+      ? searchIndexHits(searchIndex, queryWords)
+      : null
   const filteredSections = sections.map((section) => {
     if (!searchQuery.trim()) return section
+    if (indexHits) {
+      return { ...section, indicators: section.indicators.filter((ind) => indexHits.has(`${section.slug}/${ind.slug}`)) }
+    }
     const query = searchQuery.toLowerCase()
     const filtered = section.indicators.filter(
       (ind) => ind.title.toLowerCase().includes(query) || section.title.toLowerCase().includes(query)
@@ -303,6 +678,7 @@ function App() {
                           }
                           return indicator.title
                         })()}
+                        <NavSparkline serie={overview?.indicators[indicator.sheet]?.[0]?.[0]} />
                       </button>
                     </li>
                   ))}
@@ -363,6 +739,21 @@ function App() {
                 })()}
               </h2>
             </header>
+            {/* Until the indicator file is in, the static SVGs listed in the manifest stand in for the charts */}
+            {activeIndicator.file && !error && activeIndicator.chart_svgs?.map((svg, idx) =>
+              svg ? (
+                <section key={idx} className="chart-card">
+                  <div className="chart-card__body">
+                    <img className="chart-card__static" src={`${dataDir}${svg}`} alt="" />
+                  </div>
+                </section>
+              ) : null,
+            )}
+            {activeIndicator.file && !error && !activeIndicator.chart_svgs && (
+              <div className="state-card">
+                <p>Laddar indikatorn…</p>
+              </div>
+            )}
             {activeIndicator.typ && activeIndicator.typ.toLowerCase().trim() === "tabell" && activeIndicator.table && (
               <section className="chart-card">
                 <div className="table-container">
@@ -477,140 +868,20 @@ function App() {
               return (
                 <section key={chart.id} className="chart-card">
                   <div className="chart-card__body">
-                    <ResponsiveContainer width="100%" height={480}>
-                      <LineChart data={chartRows} margin={{ top: 16, right: 180, left: 12, bottom: 16 }}>
-                        <CartesianGrid stroke="#E5E7EB" vertical={false} />
-                        <XAxis
-                          dataKey="category"
-                          tick={{ fontSize: 14, fill: '#6B7280' }}
-                          tickLine={false}
-                          axisLine={{ stroke: '#D1D5DB' }}
-                        />
-                        <YAxis
-                          tick={{ fontSize: 14, fill: '#6B7280' }}
-                          tickLine={false}
-                          axisLine={{ stroke: '#D1D5DB' }}
-                          domain={yAxisDomain}
-                        />
-                        <Tooltip
-                          contentStyle={{ borderRadius: 12, borderColor: '#E5E7EB' }}
-                          formatter={(value: ValueType, name: NameType) => {
-                            const numericValue =
-                              typeof value === 'number'
-                                ? value
-                                : typeof value === 'string'
-                                  ? Number(value)
-                                  : null
-                            const label = typeof name === 'string' ? name : String(name ?? '')
-                            const display =
-                              typeof numericValue === 'number' && Number.isFinite(numericValue)
-                                ? `${Math.round(numericValue)}%`
-                                : '–'
-                            return [display, label]
-                          }}
-                          labelFormatter={(label) => `År ${label}`}
-                        />
-                        {chart.series.map((serie, index) => {
-                          const color = palette[index % palette.length]
-                          // Find the last valid data point index for this series
-                          let lastValidIndex = -1
-                          for (let i = chartRows.length - 1; i >= 0; i--) {
-                            const value = chartRows[i][serie.name]
-                            if (value !== null && value !== undefined && !isNaN(Number(value))) {
-                              lastValidIndex = i
-                              break
-                            }
-                          }
-                          
-                          // Check if this is partiledarpopularitet (no % sign)
-                          const isPartiledare = activeIndicator.title.toLowerCase().includes('partiledarpopularitet')
-                          
-                          return (
-                            <Line
-                              key={serie.name}
-                              type="linear"
-                              dataKey={serie.name}
-                              stroke={color}
-                              strokeWidth={2.5}
-                              dot={{ r: 4, fill: color, strokeWidth: 2, stroke: '#fff' }}
-                              activeDot={{ r: 6, fill: color, strokeWidth: 2, stroke: '#fff' }}
-                              isAnimationActive={true}
-                              animationDuration={600}
-                              connectNulls={true}
-                            >
-                              <LabelList
-                                dataKey={serie.name}
-                                content={({ x, y, value, index: pointIndex }: any) => {
-                                  // Only show label for the last valid data point
-                                  if (pointIndex === lastValidIndex && lastValidIndex >= 0) {
-                                    if (value !== null && value !== undefined && !isNaN(Number(value))) {
-                                      // Simple small offset based on index to prevent exact overlap
-                                      // This keeps labels close to their data points
-                                      const verticalOffset = (index - (chart.series.length - 1) / 2) * 3
-                                      
-                                      // Format value - no % for partiledarpopularitet
-                                      const displayValue = Math.round(Number(value))
-                                      const percentageText = isPartiledare ? `${displayValue}` : `${displayValue}%`
-                                      // Add series name (label) to the value
-                                      const fullLabel = `${percentageText} ${serie.name}`
-                                      
-                                      // Split long labels into two lines if needed (max 28 chars per line)
-                                      const maxLength = 28
-                                      if (fullLabel.length > maxLength) {
-                                        const spaceIndex = fullLabel.lastIndexOf(' ', maxLength)
-                                        if (spaceIndex > 0 && spaceIndex < fullLabel.length - 1) {
-                                          const line1 = fullLabel.substring(0, spaceIndex)
-                                          const line2 = fullLabel.substring(spaceIndex + 1)
-                                          
-                                          return (
-                                            <g>
-                                              <text
-                                                x={x + 8}
-                                                y={y + verticalOffset}
-                                                fill={color}
-                                                fontSize={14}
-                                                fontWeight={500}
-                                                textAnchor="start"
-                                              >
-                                                {line1}
-                                              </text>
-                                              <text
-                                                x={x + 8}
-                                                y={y + verticalOffset + 14}
-                                                fill={color}
-                                                fontSize={14}
-                                                fontWeight={500}
-                                                textAnchor="start"
-                                              >
-                                                {line2}
-                                              </text>
-                                            </g>
-                                          )
-                                        }
-                                      }
-                                      
-                                      return (
-                                        <text
-                                          x={x + 8}
-                                          y={y + verticalOffset}
-                                          fill={color}
-                                          fontSize={14}
-                                          fontWeight={500}
-                                          textAnchor="start"
-                                        >
-                                          {fullLabel}
-                                        </text>
-                                      )
-                                    }
-                                  }
-                                  return null
-                                }}
-                              />
-                            </Line>
-                          )
-                        })}
-                      </LineChart>
-                    </ResponsiveContainer>
+                    <Suspense
+                      fallback={
+                        chart.svg ? (
+                          <img className="chart-card__static" src={`${dataDir}${chart.svg}`} alt={chart.title ?? ''} />
+                        ) : null
+                      }
+                    >
+                      <InteractiveChart
+                        chart={chart}
+                        chartRows={chartRows}
+                        yAxisDomain={yAxisDomain}
+                        isPartiledare={activeIndicator.title.toLowerCase().includes('partiledarpopularitet')}
+                      />
+                    </Suspense>
                   </div>
                   {(activeIndicator.fraga || activeIndicator.kommentar) && (
                     <div className="chart-card__metadata">
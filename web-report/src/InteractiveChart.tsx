@@ -0,0 +1,204 @@
+import {
+  Area,
+  Bar,
+  CartesianGrid,
+  ComposedChart,
+  Line,
+  ResponsiveContainer,
+  Tooltip,
+  XAxis,
+  YAxis,
+  LabelList,
+} from 'recharts'
+import type { NameType, ValueType } from 'recharts/types/component/DefaultTooltipContent'
+import type { ChartDefinition } from './App'
+
+const palette = ['#111827', '#A44E07', '#2563EB', '#059669', '#9333EA', '#DC2626']
+
+type InteractiveChartProps = {
+  chart: ChartDefinition
+  chartRows: Record<string, string | number | null>[]
+  yAxisDomain: number[]
+  isPartiledare: boolean // partiledarpopularitet: no % sign
+}
+
+// Loaded as a separate chunk; until it is ready App shows the chart's static SVG (--svg).
+// Each series is drawn as its own type in combo charts, else as the chart's, like the static SVG;
+// other types (pie, scatter...) fall back to lines
+function InteractiveChart({ chart, chartRows, yAxisDomain, isPartiledare }: InteractiveChartProps) {
+  return (
+    <ResponsiveContainer width="100%" height={480}>
+      <ComposedChart data={chartRows} margin={{ top: 16, right: 180, left: 12, bottom: 16 }}>
+        <CartesianGrid stroke="#E5E7EB" vertical={false} />
+        <XAxis
+          dataKey="category"
+          tick={{ fontSize: 14, fill: '#6B7280' }}
+          tickLine={false}
+          axisLine={{ stroke: '#D1D5DB' }}
+        />
+        <YAxis
+          tick={{ fontSize: 14, fill: '#6B7280' }}
+          tickLine={false}
+          axisLine={{ stroke: '#D1D5DB' }}
+          domain={yAxisDomain}
+        />
+        <Tooltip
+          contentStyle={{ borderRadius: 12, borderColor: '#E5E7EB' }}
+          formatter={(value: ValueType, name: NameType) => {
+            const numericValue =
+              typeof value === 'number'
+                ? value
+                : typeof value === 'string'
+                  ? Number(value)
+                  : null
+            const label = typeof name === 'string' ? name : String(name ?? '')
+            const display =
+              typeof numericValue === 'number' && Number.isFinite(numericValue)
+                ? `${Math.round(numericValue)}%`
+                : '–'
+            return [display, label]
+          }}
+          labelFormatter={(label) => `År ${label}`}
+        />
+        {chart.series.map((serie, index) => {
+          const color = palette[index % palette.length]
+          // Find the last valid data point index for this series
+          let lastValidIndex = -1
+          for (let i = chartRows.length - 1; i >= 0; i--) {
+            const value = chartRows[i][serie.name]
+            if (value !== null && value !== undefined && !isNaN(Number(value))) {
+              lastValidIndex = i
+              break
+            }
+          }
+
+          const serieType = serie.type ?? chart.type
+          const endLabel = (
+            <LabelList
+              dataKey={serie.name}
+              content={({ x: pointX, y, width, value, index: pointIndex }: any) => {
+                // Bars are labelled past their right edge
+                const x = serieType === 'bar' && typeof width === 'number' ? pointX + width : pointX
+                // Only show label for the last valid data point
+                if (pointIndex === lastValidIndex && lastValidIndex >= 0) {
+                  if (value !== null && value !== undefined && !isNaN(Number(value))) {
+                    // Simple small offset based on index to prevent exact overlap
+                    // This keeps labels close to their data points
+                    const verticalOffset = (index - (chart.series.length - 1) / 2) * 3
+
+                    // Format value - no % for partiledarpopularitet
+                    const displayValue = Math.round(Number(value))
+                    const percentageText = isPartiledare ? `${displayValue}` : `${displayValue}%`
+                    // Add series name (label) to the value
+                    const fullLabel = `${percentageText} ${serie.name}`
+
+                    // Split long labels into two lines if needed (max 28 chars per line)
+                    const maxLength = 28
+                    if (fullLabel.length > maxLength) {
+                      const spaceIndex = fullLabel.lastIndexOf(' ', maxLength)
+                      if (spaceIndex > 0 && spaceIndex < fullLabel.length - 1) {
+                        const line1 = fullLabel.substring(0, spaceIndex)
+                        const line2 = fullLabel.substring(spaceIndex + 1)
+
+                        return (
+                          <g>
+                            <text
+                              x={x + 8}
+                              y={y + verticalOffset}
+                              fill={color}
+                              fontSize={14}
+                              fontWeight={500}
+                              textAnchor="start"
+                            >
+                              {line1}
+                            </text>
+                            <text
+                              x={x + 8}
+                              y={y + verticalOffset + 14}
+                              fill={color}
+                              fontSize={14}
+                              fontWeight={500}
+                              textAnchor="start"
+                            >
+                              {line2}
+                            </text>
+                          </g>
+                        )
+                      }
+                    }
+
+                    return (
+                      <text
+                        x={x + 8}
+                        y={y + verticalOffset}
+                        fill={color}
+                        fontSize={14}
+                        fontWeight={500}
+                        textAnchor="start"
+                      >
+                        {fullLabel}
+                      </text>
+                    )
+                  }
+                }
+                return null
+              }}
+            />
+          )
+
+          if (serieType === 'bar') {
+            return (
+              <Bar
+                key={serie.name}
+                dataKey={serie.name}
+                fill={color}
+                isAnimationActive={true}
+                animationDuration={600}
+              >
+                {endLabel}
+              </Bar>
+            )
+          }
+          if (serieType === 'area') {
+            return (
+              <Area
+                key={serie.name}
+                type="linear"
+                dataKey={serie.name}
+                stroke={color}
+                strokeWidth={2.5}
+                fill={color}
+                fillOpacity={0.2}
+                dot={{ r: 4, fill: color, strokeWidth: 2, stroke: '#fff' }}
+                activeDot={{ r: 6, fill: color, strokeWidth: 2, stroke: '#fff' }}
+                isAnimationActive={true}
+                animationDuration={600}
+                connectNulls={true}
+              >
+                {endLabel}
+              </Area>
+            )
+          }
+          return (
+            <Line
+              key={serie.name}
+              type="linear"
+              dataKey={serie.name}
+              stroke={color}
+              strokeWidth={2.5}
+              dot={{ r: 4, fill: color, strokeWidth: 2, stroke: '#fff' }}
+              activeDot={{ r: 6, fill: color, strokeWidth: 2, stroke: '#fff' }}
+              isAnimationActive={true}
+              animationDuration={600}
+              connectNulls={true}
+            >
+              {endLabel}
+            </Line>
+          )
+        })}
+      </ComposedChart>
+    </ResponsiveContainer>
+  )
+}
+
+export default InteractiveChart
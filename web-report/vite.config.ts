@@ -9,5 +9,9 @@ export default defineConfig({
     // Ensure dev server handles the base path correctly
     strictPort: false,
     host: true, // Allow external access (for ngrok testing)
+    // With REPORT_DATA_SERVER=http://127.0.0.1:8765, read the report from `export_report_data.py --serve`
+    proxy: process.env.REPORT_DATA_SERVER
+      ? { '/svenskatrender/data/report-data.json': process.env.REPORT_DATA_SERVER }
+      : undefined,
   },
 })